@@ -5,11 +5,17 @@ Configuration Page - Network Configuration Management and Templates
 
 import streamlit as st
 import pandas as pd
-from datetime import datetime
+import numpy as np
+from datetime import datetime, timedelta
 from typing import Dict, Any, List, Optional
 import logging
 import json
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 # Import our modular components
 from components.forms import device_selector
 from components.tables import config_template_table, config_history_table
@@ -17,18 +23,105 @@ from components.metrics import config_metrics_row
 from utils.shared_utils import (
     PerformanceMonitor,
     notification_manager,
-    show_loading_spinner
+    show_loading_spinner,
+    get_time_ago,
+    fragment,
+    inventory_version
 )
 from utils.data_processing import DataProcessor
 
 logger = logging.getLogger(__name__)
 
+# History time-range filter -> lookback window (None means no lower bound)
+HISTORY_TIME_RANGES = {
+    "Last 24h": timedelta(hours=24),
+    "Last 7 days": timedelta(days=7),
+    "Last 30 days": timedelta(days=30),
+    "All time": None
+}
+HISTORY_PAGE_SIZE = 50
+BACKUP_RECENT_WINDOW = timedelta(days=7)
+
+# Fast JSON parsing for uploaded exports (and any template variables still stored as text)
+_json_loads = orjson.loads if orjson is not None else json.loads
+
+
+def _dumps_export(data: Any) -> bytes:
+    """Serialize export payload to indented JSON bytes (orjson when available)"""
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY, default=str)
+    return json.dumps(data, indent=2, default=str).encode('utf-8')
+
+
+@st.cache_resource
+def _get_performance_monitor() -> PerformanceMonitor:
+    """Shared PerformanceMonitor instance across reruns"""
+    return PerformanceMonitor()
+
+
+@st.cache_resource
+def _get_data_processor() -> DataProcessor:
+    """Shared DataProcessor instance across reruns"""
+    return DataProcessor()
+
+
+def _template_variable_types(variables: Any) -> Dict[str, str]:
+    """Template variable schema as {name: type} (ConfigManager hands the variables over already parsed)"""
+    if isinstance(variables, str):
+        variables = _json_loads(variables)
+    if isinstance(variables, list):
+        # Templates created by ConfigManager store a plain list of names
+        return {name: "string" for name in variables}
+    return variables
+
+
+@st.cache_data(ttl=30)
+def _load_templates(_config_manager) -> List[Dict[str, Any]]:
+    """Load all configuration templates (cached, cleared on save/import)"""
+    return _config_manager.get_all_templates()
+
+
+@st.cache_data(ttl=30)
+def _load_devices(_device_manager, version: int) -> List[Dict[str, Any]]:
+    """Load all devices (cached per shared inventory version, so adds/deletes elsewhere show up)"""
+    return _device_manager.get_all_devices()
+
+
+@st.cache_data(ttl=60)
+def _load_backup_times(_config_manager, device_ids: tuple) -> Dict[str, Optional[datetime]]:
+    """Load last backup time per device in a single query (cached per device set)"""
+    return _config_manager.get_last_backup_times(list(device_ids))
+
+
+@st.cache_data(ttl=30)
+def _load_history(_config_manager, time_filter: str, action_filter: str,
+                  user_filter: str, page: int) -> List[Dict[str, Any]]:
+    """Load one page of filtered configuration history (cached)"""
+    lookback = HISTORY_TIME_RANGES.get(time_filter)
+    # History timestamps are stored as SQLite CURRENT_TIMESTAMP (UTC)
+    since = datetime.utcnow() - lookback if lookback else None
+    
+    return _config_manager.get_configuration_history(
+        since=since,
+        action=action_filter.lower() if action_filter != "All" else None,
+        user=user_filter or None,
+        limit=HISTORY_PAGE_SIZE,
+        offset=(page - 1) * HISTORY_PAGE_SIZE
+    )
+
+
+@st.cache_data(ttl=60)
+def _load_audit_summary(_config_manager) -> Dict[str, Any]:
+    """Load audit metrics (cached)"""
+    return _config_manager.get_audit_summary()
+
+
 class ConfigurationPage:
     """Configuration management and template deployment page"""
     
     def __init__(self):
-        self.performance_monitor = PerformanceMonitor()
-        self.data_processor = DataProcessor()
+        self.performance_monitor = _get_performance_monitor()
+        self.data_processor = _get_data_processor()
     
     def render(self):
         """Render the configuration page"""
@@ -49,24 +142,27 @@ class ConfigurationPage:
             st.error("❌ Device manager not initialized")
             return
         
-        # Configuration tabs
-        tab1, tab2, tab3, tab4 = st.tabs([
-            "📝 Templates", 
-            "🚀 Deployment", 
-            "📊 Configuration Backup",
-            "📋 History & Audit"
-        ])
+        # Configuration sections (only the active one is rendered per rerun)
+        active_section = st.radio(
+            "Section",
+            [
+                "📝 Templates",
+                "🚀 Deployment",
+                "📊 Configuration Backup",
+                "📋 History & Audit"
+            ],
+            horizontal=True,
+            label_visibility="collapsed",
+            key="cfg_tab"
+        )
         
-        with tab1:
+        if active_section == "📝 Templates":
             self._render_templates_tab(config_manager, device_manager)
-        
-        with tab2:
+        elif active_section == "🚀 Deployment":
             self._render_deployment_tab(config_manager, device_manager)
-        
-        with tab3:
+        elif active_section == "📊 Configuration Backup":
             self._render_backup_tab(config_manager, device_manager)
-        
-        with tab4:
+        else:
             self._render_history_tab(config_manager)
     
     def _render_templates_tab(self, config_manager, device_manager):
@@ -86,8 +182,8 @@ class ConfigurationPage:
                 self._show_template_loader()
         
         with col3:
-            if st.button("🔄 Refresh List", use_container_width=True):
-                st.rerun()
+            # Clearing only the templates cache; the click itself triggers the rerun
+            st.button("🔄 Refresh List", use_container_width=True, on_click=_load_templates.clear)
         
         with col4:
             if st.button("📤 Export All", use_container_width=True):
@@ -100,7 +196,7 @@ class ConfigurationPage:
         # Template list
         st.markdown("### 📋 Available Templates")
         try:
-            templates = config_manager.get_all_templates()
+            templates = _load_templates(config_manager)
             
             if templates:
                 config_template_table(templates, config_manager)
@@ -115,6 +211,7 @@ class ConfigurationPage:
             logger.error(f"❌ Error loading templates: {e}")
             st.error("Error loading configuration templates")
     
+    @fragment
     def _render_deployment_tab(self, config_manager, device_manager):
         """Render configuration deployment interface"""
         st.markdown("### 🚀 Configuration Deployment")
@@ -125,7 +222,7 @@ class ConfigurationPage:
         
         with col1:
             # Template selection
-            templates = config_manager.get_all_templates()
+            templates = _load_templates(config_manager)
             if not templates:
                 st.warning("No templates available. Create templates first.")
                 return
@@ -134,7 +231,7 @@ class ConfigurationPage:
             selected_template = st.selectbox("Select Template:", template_names)
             
             # Device selection
-            devices = device_manager.get_all_devices()
+            devices = _load_devices(device_manager, inventory_version())
             if not devices:
                 st.warning("No devices available. Add devices first.")
                 return
@@ -172,7 +269,8 @@ class ConfigurationPage:
             if st.button("🚀 Deploy", use_container_width=True):
                 self._deploy_configuration(
                     config_manager, selected_template, template_vars, 
-                    deployment_option, selected_device, dry_run, backup_before, rollback_on_error
+                    deployment_option, selected_device, dry_run, backup_before, rollback_on_error,
+                    devices
                 )
         
         with col3:
@@ -183,6 +281,7 @@ class ConfigurationPage:
         st.markdown("### 📋 Recent Deployments")
         self._show_recent_deployments(config_manager)
     
+    @fragment
     def _render_backup_tab(self, config_manager, device_manager):
         """Render configuration backup interface"""
         st.markdown("### 📊 Configuration Backup")
@@ -210,16 +309,19 @@ class ConfigurationPage:
         # Backup status
         st.markdown("### 📊 Backup Status")
         try:
-            devices = device_manager.get_all_devices()
+            devices = _load_devices(device_manager, inventory_version())
             backup_status = self._get_backup_status(config_manager, devices)
             
             # Backup metrics
-            config_metrics_row(backup_status)
+            backed_up = backup_status[backup_status['last_backup'] != 'Never'] if not backup_status.empty else backup_status
+            config_metrics_row({
+                'backup_count': len(backed_up),
+                'last_backup': backed_up['last_backup'].max() if not backed_up.empty else 'Never'
+            })
             
             # Backup details
-            if backup_status:
-                df = pd.DataFrame(backup_status)
-                st.dataframe(df, use_container_width=True)
+            if not backup_status.empty:
+                st.dataframe(backup_status, use_container_width=True)
             else:
                 st.info("No backup data available")
                 
@@ -242,7 +344,7 @@ class ConfigurationPage:
         with col1:
             time_filter = st.selectbox(
                 "Time Range:",
-                ["Last 24h", "Last 7 days", "Last 30 days", "All time"]
+                list(HISTORY_TIME_RANGES)
             )
         
         with col2:
@@ -254,13 +356,14 @@ class ConfigurationPage:
         with col3:
             user_filter = st.text_input("User Filter:", placeholder="Filter by user...")
         
+        page = st.number_input("Page:", min_value=1, value=1, step=1, key="cfg_history_page")
+        
         # Configuration history
         try:
-            history = config_manager.get_configuration_history()
-            filtered_history = self._filter_history(history, time_filter, action_filter, user_filter)
+            history = _load_history(config_manager, time_filter, action_filter, user_filter, int(page))
             
-            if filtered_history:
-                config_history_table(filtered_history)
+            if history:
+                config_history_table(history)
             else:
                 st.info("No configuration history matches the filters")
                 
@@ -320,21 +423,26 @@ interface GigabitEthernet0/0
     def _get_template_variables(self, config_manager, template_name):
         """Get template variables input form"""
         try:
-            template = config_manager.get_template(template_name)
+            template = config_manager.get_template_by_name(template_name)
             if not template or not template.get('variables'):
                 return {}
             
-            variables = json.loads(template['variables'])
+            variables = _template_variable_types(template['variables'])
             template_vars = {}
             
-            st.markdown("**Required Variables:**")
-            for var_name, var_type in variables.items():
-                if var_type == "string":
-                    template_vars[var_name] = st.text_input(f"{var_name}:", key=f"var_{var_name}")
-                elif var_type == "number":
-                    template_vars[var_name] = st.number_input(f"{var_name}:", key=f"var_{var_name}")
-                elif var_type == "boolean":
-                    template_vars[var_name] = st.checkbox(f"{var_name}:", key=f"var_{var_name}")
+            # Inputs live in a form so typing does not rerun the page; values
+            # returned here are the ones committed by the last "Apply Variables"
+            with st.form(f"tpl_vars_{template_name}"):
+                st.markdown("**Required Variables:**")
+                for var_name, var_type in variables.items():
+                    if var_type == "string":
+                        template_vars[var_name] = st.text_input(f"{var_name}:", key=f"var_{var_name}")
+                    elif var_type == "number":
+                        template_vars[var_name] = st.number_input(f"{var_name}:", key=f"var_{var_name}")
+                    elif var_type == "boolean":
+                        template_vars[var_name] = st.checkbox(f"{var_name}:", key=f"var_{var_name}")
+                
+                st.form_submit_button("✅ Apply Variables")
             
             return template_vars
             
@@ -345,8 +453,16 @@ interface GigabitEthernet0/0
     def _preview_configuration(self, config_manager, template_name, variables, device):
         """Preview generated configuration"""
         try:
+            template = config_manager.get_template_by_name(template_name)
+            if not template:
+                st.warning(f"Template '{template_name}' not found")
+                return
+            
+            source = template.get('content') or template.get('template_content', '')
+            
             with show_loading_spinner("Generating configuration preview..."):
-                preview = config_manager.render_template(template_name, variables)
+                compiled = config_manager.compile_template(source)
+                preview = compiled.render(**variables)
             
             st.markdown("### 👁️ Configuration Preview")
             if device:
@@ -359,7 +475,8 @@ interface GigabitEthernet0/0
             st.error(f"Error generating configuration preview: {e}")
     
     def _deploy_configuration(self, config_manager, template_name, variables, 
-                            deployment_option, device, dry_run, backup_before, rollback_on_error):
+                            deployment_option, device, dry_run, backup_before, rollback_on_error,
+                            devices):
         """Deploy configuration to devices"""
         try:
             with show_loading_spinner("Deploying configuration..."):
@@ -373,12 +490,14 @@ interface GigabitEthernet0/0
                         st.success(f"✅ Configuration deployed to {device['hostname']}")
                 else:
                     result = config_manager.deploy_to_all(
-                        template_name, variables, dry_run, backup_before
+                        devices, template_name, variables, dry_run, backup_before
                     )
-                    if dry_run:
-                        st.success("✅ Dry run completed for all devices")
+                    action = "Dry run completed" if dry_run else "Configuration deployed"
+                    if result.get('failed', 0) == 0:
+                        st.success(f"✅ {action} for all {result.get('successful', 0)} devices")
                     else:
-                        st.success("✅ Configuration deployed to all devices")
+                        st.warning(f"⚠️ {action} for {result.get('successful', 0)} devices, "
+                                   f"{result.get('failed', 0)} failed")
                 
                 # Show deployment results
                 if result.get('details'):
@@ -389,6 +508,8 @@ interface GigabitEthernet0/0
                     f"Configuration {'previewed' if dry_run else 'deployed'} successfully",
                     "success"
                 )
+                _load_history.clear()
+                _load_audit_summary.clear()
                 
         except Exception as e:
             logger.error(f"❌ Error deploying configuration: {e}")
@@ -397,10 +518,13 @@ interface GigabitEthernet0/0
     def _backup_all_devices(self, config_manager, device_manager):
         """Backup configurations from all devices"""
         try:
-            devices = device_manager.get_all_devices()
+            devices = _load_devices(device_manager, inventory_version())
             
             with show_loading_spinner("Backing up all device configurations..."):
                 results = config_manager.backup_all_devices()
+            _load_history.clear()
+            _load_audit_summary.clear()
+            _load_backup_times.clear()
             
             successful = results.get('successful', 0)
             failed = results.get('failed', 0)
@@ -421,7 +545,7 @@ interface GigabitEthernet0/0
     
     def _backup_selected_device(self, config_manager, device_manager):
         """Backup configuration from selected device"""
-        devices = device_manager.get_all_devices()
+        devices = _load_devices(device_manager, inventory_version())
         if not devices:
             st.warning("No devices available")
             return
@@ -433,6 +557,9 @@ interface GigabitEthernet0/0
                 try:
                     with show_loading_spinner(f"Backing up {selected_device['hostname']}..."):
                         result = config_manager.backup_device(selected_device['id'])
+                    _load_history.clear()
+                    _load_audit_summary.clear()
+                    _load_backup_times.clear()
                     
                     if result.get('success'):
                         st.success(f"✅ Configuration backed up for {selected_device['hostname']}")
@@ -443,32 +570,35 @@ interface GigabitEthernet0/0
                     logger.error(f"❌ Error backing up device: {e}")
                     st.error(f"Error backing up device: {e}")
     
-    def _get_backup_status(self, config_manager, devices):
+    def _get_backup_status(self, config_manager, devices) -> pd.DataFrame:
         """Get backup status for all devices"""
         try:
-            backup_status = []
-            
-            for device in devices:
-                last_backup = config_manager.get_last_backup_time(device['id'])
-                status = {
-                    'hostname': device['hostname'],
-                    'ip_address': device['ip_address'],
-                    'device_type': device['device_type'],
-                    'last_backup': last_backup.strftime('%Y-%m-%d %H:%M') if last_backup else 'Never',
-                    'status': 'Recent' if last_backup and (datetime.now() - last_backup).days < 7 else 'Outdated'
-                }
-                backup_status.append(status)
+            if not devices:
+                return pd.DataFrame()
+            
+            df = pd.DataFrame(devices)[['id', 'hostname', 'ip_address', 'device_type']]
+            df['id'] = df['id'].astype(str)
+            last_backups = _load_backup_times(config_manager, tuple(df['id']))
+            
+            # One threshold for the whole frame: a backup is recent if newer than 7 days.
+            # Backup times are SQLite CURRENT_TIMESTAMP values (naive UTC), so compare in UTC
+            threshold = pd.Timestamp.now(tz='UTC').tz_localize(None) - BACKUP_RECENT_WINDOW
+            last_backup = pd.to_datetime(df['id'].map(last_backups))
+            recent = last_backup >= threshold
+            
+            df['last_backup'] = last_backup.dt.strftime('%Y-%m-%d %H:%M UTC').fillna('Never')
+            df['status'] = np.where(recent, 'Recent', 'Outdated')
             
-            return backup_status
+            return df.drop(columns='id')
             
         except Exception as e:
             logger.error(f"❌ Error getting backup status: {e}")
-            return []
+            return pd.DataFrame()
     
     def _render_config_comparison(self, config_manager, device_manager):
         """Render configuration comparison interface"""
         try:
-            devices = device_manager.get_all_devices()
+            devices = _load_devices(device_manager, inventory_version())
             if len(devices) < 2:
                 st.info("Need at least 2 devices for configuration comparison")
                 return
@@ -515,9 +645,8 @@ interface GigabitEthernet0/0
         try:
             deployments = config_manager.get_recent_deployments(limit=10)
             
-            if deployments:
-                df = pd.DataFrame(deployments)
-                st.dataframe(df, use_container_width=True)
+            if not deployments.empty:
+                st.dataframe(deployments, use_container_width=True)
             else:
                 st.info("No recent deployments")
                 
@@ -554,6 +683,7 @@ interface GigabitEthernet0/0
             }
             
             config_manager.save_template(template_data)
+            _load_templates.clear()
             st.success(f"✅ Template '{name}' saved successfully")
             st.session_state.show_template_editor = False
             
@@ -611,9 +741,9 @@ interface range GigabitEthernet1/0/1-48
                 }
             ]
             
-            for template in sample_templates:
-                config_manager.save_template(template)
+            config_manager.save_templates(sample_templates)
             
+            _load_templates.clear()
             st.success("✅ Sample templates loaded successfully")
             st.rerun()
             
@@ -624,10 +754,10 @@ interface range GigabitEthernet1/0/1-48
     def _export_all_templates(self, config_manager):
         """Export all templates to JSON"""
         try:
-            templates = config_manager.get_all_templates()
+            templates = _load_templates(config_manager)
             
             if templates:
-                templates_json = json.dumps(templates, indent=2, default=str)
+                templates_json = _dumps_export(templates)
                 
                 st.download_button(
                     label="📥 Download All Templates",
@@ -642,39 +772,31 @@ interface range GigabitEthernet1/0/1-48
             logger.error(f"❌ Error exporting templates: {e}")
             st.error("Error exporting templates")
     
-    def _filter_history(self, history, time_filter, action_filter, user_filter):
-        """Filter configuration history"""
-        filtered = history
-        
-        # Filter by action
-        if action_filter != "All":
-            filtered = [h for h in filtered if h.get('action', '').lower() == action_filter.lower()]
-        
-        # Filter by user
-        if user_filter:
-            filtered = [h for h in filtered if user_filter.lower() in h.get('user', '').lower()]
-        
-        return filtered
-    
     def _render_audit_summary(self, config_manager):
         """Render configuration audit summary"""
         try:
-            # Sample audit metrics
+            summary = _load_audit_summary(config_manager)
+            success_pct = summary.get('success_pct')
+            last_backup_ago = summary.get('last_backup_ago')
+            
             col1, col2, col3, col4 = st.columns(4)
             
             with col1:
-                st.metric("Total Changes", "42", delta="5 this week")
+                st.metric("Total Changes", summary.get('total_changes', 0),
+                          delta=f"{summary.get('changes_this_week', 0)} this week")
             
             with col2:
-                st.metric("Active Templates", "8", delta="2 new")
+                st.metric("Active Templates", summary.get('active_templates', 0))
             
             with col3:
-                st.metric("Successful Deploys", "95%", delta="2%")
+                st.metric("Successful Deploys", f"{success_pct:.0f}%" if success_pct is not None else "N/A")
             
             with col4:
-                st.metric("Last Backup", "2h ago", delta="-1h")
+                st.metric("Last Backup",
+                          get_time_ago(datetime.now() - last_backup_ago) if last_backup_ago is not None else "Never")
                 
         except Exception as e:
+            logger.error(f"❌ Error loading audit summary: {e}")
             st.info("Audit summary not available")
     
     def _show_template_loader(self):
@@ -693,7 +815,7 @@ interface range GigabitEthernet1/0/1-48
                 
                 if uploaded_file.name.endswith('.json'):
                     # JSON template export
-                    templates = json.loads(content)
+                    templates = _json_loads(content)
                     st.success(f"Loaded {len(templates)} templates from JSON file")
                 else:
                     # Raw template file
@@ -723,7 +845,7 @@ interface range GigabitEthernet1/0/1-48
             backups = config_manager.get_all_backups()
             
             if backups:
-                backups_json = json.dumps(backups, indent=2, default=str)
+                backups_json = _dumps_export(backups)
                 
                 st.download_button(
                     label="📥 Download All Backups",
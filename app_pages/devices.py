@@ -5,18 +5,24 @@ Devices Page - Simplified Device Management and Inventory
 
 import streamlit as st
 import pandas as pd
+import numpy as np
 from datetime import datetime
 from typing import Dict, Any, List, Optional
+from concurrent.futures import Future, ThreadPoolExecutor
 import logging
 
 # Import our modular components
 from components.forms import add_device_form, device_selector
 from components.tables import device_list_table
-from components.metrics import device_metrics_row
+from components.metrics import device_metrics_row, device_metrics_summary
+from modules.device_manager import DeviceManager
 from utils.shared_utils import (
     PerformanceMonitor,
     notification_manager,
-    show_loading_spinner
+    show_loading_spinner,
+    fragment,
+    inventory_version,
+    bump_inventory_version
 )
 from utils.data_processing import DataProcessor
 from utils.lab_helpers import (
@@ -27,6 +33,88 @@ from utils.lab_helpers import (
 
 logger = logging.getLogger(__name__)
 
+CSV_IMPORT_CHUNK_SIZE = 50
+CSV_IMPORT_REQUIRED_COLUMNS = ('hostname', 'ip_address', 'device_type', 'username', 'password')
+
+
+@st.cache_data(ttl=30, show_spinner=False)
+def _cached_get_all_devices(_device_manager, version: int) -> List[Dict[str, Any]]:
+    """Load all devices once per inventory version"""
+    return _device_manager.get_all_devices()
+
+
+@st.cache_resource(show_spinner=False)
+def _action_executor() -> ThreadPoolExecutor:
+    """Shared worker pool for long-running device actions"""
+    return ThreadPoolExecutor(max_workers=8)
+
+
+def _pending_actions() -> Dict[str, Future]:
+    """Background device actions for this session, keyed by '<action>:<device id>'"""
+    return st.session_state.setdefault('pending_device_actions', {})
+
+
+def _completed_actions() -> Dict[str, Any]:
+    """Results (or exceptions) of finished background actions for this session, same keys"""
+    return st.session_state.setdefault('completed_device_actions', {})
+
+
+def _discover_system_info(device_id: str) -> Dict:
+    """Worker task: collect system info with its own DeviceManager, never the session's"""
+    manager = DeviceManager()
+    try:
+        return manager.discover_device_info(device_id)
+    finally:
+        manager.disconnect_device(device_id)
+
+
+@st.cache_data(ttl=30, show_spinner=False)
+def _devices_frame(_device_manager, version: int) -> pd.DataFrame:
+    """Device inventory as a DataFrame for vectorized filtering"""
+    df = pd.DataFrame(_cached_get_all_devices(_device_manager, version))
+    for column in ('hostname', 'ip_address', 'device_type', 'status'):
+        if column not in df.columns:
+            df[column] = ''
+    return df
+
+
+@st.cache_data(ttl=30, show_spinner=False)
+def _search_index(_device_manager, version: int) -> pd.DataFrame:
+    """Lowercased hostname/IP columns, aligned with _devices_frame, for case-insensitive search"""
+    df = _devices_frame(_device_manager, version)
+    return pd.DataFrame({
+        'hostname': df['hostname'].fillna('').astype(str).str.lower(),
+        'ip_address': df['ip_address'].fillna('').astype(str).str.lower(),
+    }, index=df.index)
+
+
+@st.cache_data(ttl=30, show_spinner=False)
+def _metrics_summary(_device_manager, version: int) -> Dict[str, int]:
+    """Device metric counts, recomputed only when the inventory changes"""
+    return device_metrics_summary(_cached_get_all_devices(_device_manager, version))
+
+
+@st.cache_data(ttl=30, show_spinner=False)
+def _filter_options(_device_manager, version: int) -> Dict[str, List[str]]:
+    """Device type / status filter options, built in one pass and sorted for stable widgets"""
+    types, statuses = set(), set()
+    for device in _cached_get_all_devices(_device_manager, version):
+        types.add(device.get('device_type', 'unknown'))
+        statuses.add(device.get('status', 'unknown'))
+    
+    return {
+        'device_types': ['All', *sorted(types)],
+        'statuses': ['All', *sorted(statuses)]
+    }
+
+
+@st.cache_data(ttl=30, show_spinner=False)
+def _devices_csv_bytes(_device_manager, version: int) -> bytes:
+    """Serialize the device inventory to CSV once per inventory version"""
+    devices = _cached_get_all_devices(_device_manager, version)
+    return pd.DataFrame(devices).to_csv(index=False).encode('utf-8')
+
+
 class DevicesPage:
     """Simplified device management page with CRUD operations"""
     
@@ -63,6 +151,7 @@ class DevicesPage:
         with tab3:
             self._render_device_details(device_manager)
     
+    @fragment
     def _render_device_list(self, device_manager):
         """Render device list and management"""
         st.markdown("### 📋 Device Inventory")
@@ -71,8 +160,7 @@ class DevicesPage:
         col1, col2, col3, col4 = st.columns(4)
         
         with col1:
-            if st.button("🔄 Refresh List", use_container_width=True):
-                st.rerun()
+            st.button("🔄 Refresh List", use_container_width=True, on_click=bump_inventory_version)
         
         with col2:
             if st.button("🧪 Setup Lab Devices", use_container_width=True):
@@ -88,30 +176,37 @@ class DevicesPage:
         
         # Get all devices
         try:
-            devices = device_manager.get_all_devices()
-            
             # Device metrics overview
-            device_metrics_row(devices)
+            device_metrics_row(summary=_metrics_summary(device_manager, inventory_version()))
             
             # Filters
             st.markdown("#### 🔍 Filters")
-            col1, col2, col3 = st.columns(3)
+            filter_options = _filter_options(device_manager, inventory_version())
             
-            with col1:
-                device_types = ['All'] + list(set([d.get('device_type', 'unknown') for d in devices]))
-                selected_type = st.selectbox("Device Type", device_types)
-            
-            with col2:
-                statuses = ['All'] + list(set([d.get('status', 'unknown') for d in devices]))
-                selected_status = st.selectbox("Status", statuses)
-            
-            with col3:
-                search_term = st.text_input("🔍 Search", placeholder="Search hostname or IP...")
+            # Filters only apply on submit, so typing in the search box doesn't rerun the page
+            with st.form("device_filters", clear_on_submit=False):
+                col1, col2, col3 = st.columns(3)
+                
+                with col1:
+                    selected_type = st.selectbox("Device Type", filter_options['device_types'])
+                
+                with col2:
+                    selected_status = st.selectbox("Status", filter_options['statuses'])
+                
+                with col3:
+                    search_term = st.text_input("🔍 Search", placeholder="Search hostname or IP...")
+                
+                st.form_submit_button("Apply")
             
-            # Filter devices
-            filtered_devices = self._filter_devices(
-                devices, selected_type, selected_status, search_term
-            )
+            # Filter devices (the default view needs no filtering at all)
+            if selected_type == 'All' and selected_status == 'All' and not search_term:
+                filtered_devices = _cached_get_all_devices(device_manager, inventory_version())
+            else:
+                filtered_devices = self._filter_devices(
+                    _devices_frame(device_manager, inventory_version()),
+                    selected_type, selected_status, search_term,
+                    search_index=_search_index(device_manager, inventory_version())
+                )
             
             # Display device table
             if filtered_devices:
@@ -123,12 +218,13 @@ class DevicesPage:
             logger.error(f"❌ Error loading devices: {e}")
             st.error("Error loading device list")
     
+    @fragment
     def _render_add_device(self, device_manager):
         """Render add device form"""
         st.markdown("### ➕ Add New Device")
         
         # Device form tabs
-        form_tab1, form_tab2 = st.tabs(["📝 Manual Entry", "🧪 Lab Templates"])
+        form_tab1, form_tab2, form_tab3 = st.tabs(["📝 Manual Entry", "🧪 Lab Templates", "📥 CSV Import"])
         
         with form_tab1:
             # Manual device entry
@@ -138,18 +234,31 @@ class DevicesPage:
                     "New device added to inventory", 
                     "success"
                 )
+                bump_inventory_version()
                 st.rerun()
         
         with form_tab2:
             # Lab device templates
             self._render_lab_templates(device_manager)
+        
+        with form_tab3:
+            # Bulk import from CSV
+            uploaded_file = st.file_uploader(
+                "Choose CSV file", 
+                type=['csv'],
+                help=f"CSV with columns: {', '.join(CSV_IMPORT_REQUIRED_COLUMNS)}"
+            )
+            
+            if uploaded_file and st.button("📥 Import CSV"):
+                self._import_devices_csv(uploaded_file, device_manager)
     
+    @fragment
     def _render_device_details(self, device_manager):
         """Render device details and actions"""
         st.markdown("### 📊 Device Details & Actions")
         
         # Device selector
-        devices = device_manager.get_all_devices()
+        devices = _cached_get_all_devices(device_manager, inventory_version())
         if not devices:
             st.info("No devices available. Add some devices first.")
             return
@@ -218,15 +327,76 @@ class DevicesPage:
             
             with col2:
                 if st.button("📊 System Info", use_container_width=True):
-                    st.info("System info feature coming soon...")
+                    self._submit_system_info(device, device_manager)
                 
                 if st.button("🗑️ Delete Device", use_container_width=True, type="secondary"):
                     self._delete_device(device, device_manager)
             
+            self._render_pending_actions(device)
+            
         except Exception as e:
             logger.error(f"❌ Error rendering device actions: {e}")
             st.error("Error loading device actions")
     
+    def _submit_system_info(self, device: Dict[str, Any], device_manager):
+        """Queue system info discovery on the worker pool so the page stays responsive"""
+        key = f"system_info:{device['id']}"
+        pending = _pending_actions()
+        
+        if key in pending and not pending[key].done():
+            st.info(f"System info for {device['hostname']} is already being collected")
+            return
+        
+        _completed_actions().pop(key, None)
+        pending[key] = _action_executor().submit(_discover_system_info, device['id'])
+    
+    def _render_pending_actions(self, device: Dict[str, Any]):
+        """Show background action results for this device, polling only while one is running"""
+        key = f"system_info:{device['id']}"
+        pending = _pending_actions()
+        future = pending.get(key)
+        
+        if future is not None and not future.done():
+            self._poll_pending_action(device, future)
+            return
+        
+        if future is not None:
+            # Finished: keep only the outcome so the Future (and its worker state) can be released
+            del pending[key]
+            try:
+                info = future.result()
+                _completed_actions()[key] = info
+                # Discovery writes model / OS version back to the inventory when it found them
+                if 'model' in info or 'os_version' in info:
+                    bump_inventory_version()
+            except Exception as e:
+                logger.error(f"❌ Error getting system info: {e}")
+                _completed_actions()[key] = e
+        
+        if key not in _completed_actions():
+            return
+        
+        info = _completed_actions()[key]
+        if isinstance(info, Exception):
+            st.error(f"Error getting system info: {info}")
+            return
+        
+        if not info:
+            st.warning(f"⚠️ Could not collect system info from {device['hostname']}")
+            return
+        
+        st.markdown("**System Info:**")
+        st.json({k: v for k, v in info.items() if k != 'version_output'})
+        with st.expander("show version"):
+            st.code(info.get('version_output', ''))
+    
+    @fragment(run_every=1)
+    def _poll_pending_action(self, device: Dict[str, Any], future: Future):
+        """Poll a running background action; rerun the page once it finishes so polling stops"""
+        if future.done():
+            st.rerun()
+        st.info(f"⏳ Collecting system info from {device['hostname']}...")
+    
     def _render_lab_templates(self, device_manager):
         """Render lab device templates"""
         st.markdown("#### 🧪 Lab Device Templates")
@@ -240,54 +410,70 @@ class DevicesPage:
             
             st.markdown("**Quick Add Lab Devices:**")
             
-            for device in lab_devices:
-                col1, col2, col3 = st.columns([3, 1, 1])
-                
-                with col1:
-                    st.write(f"**{device['hostname']}** ({device['device_type']}) - {device['ip_address']}")
-                
-                with col2:
-                    if st.button(f"➕ Add", key=f"add_lab_{device['hostname']}"):
+            lab_df = pd.DataFrame(lab_devices, columns=['hostname', 'device_type', 'ip_address'])
+            event = st.dataframe(
+                lab_df,
+                use_container_width=True,
+                hide_index=True,
+                on_select="rerun",
+                selection_mode="multi-row",
+                key="lab_templates_table"
+            )
+            selected = [lab_devices[i] for i in event.selection.rows]
+            
+            col1, col2 = st.columns(2)
+            
+            with col1:
+                if st.button("➕ Add selected", use_container_width=True, disabled=not selected):
+                    added = 0
+                    for device in selected:
                         try:
                             device_manager.add_device(device)
-                            st.success(f"✅ {device['hostname']} added")
-                            st.rerun()
+                            added += 1
                         except Exception as e:
                             st.error(f"❌ Error adding {device['hostname']}: {e}")
-                
-                with col3:
-                    if st.button(f"🔗 Test", key=f"test_lab_{device['hostname']}"):
+                    if added:
+                        bump_inventory_version()
+                        st.success(f"✅ Added {added} lab device(s)")
+                        st.rerun()
+            
+            with col2:
+                if st.button("🔗 Test selected", use_container_width=True, disabled=not selected):
+                    for device in selected:
                         self._test_lab_device_connectivity(device)
         except Exception as e:
             logger.error(f"❌ Error rendering lab templates: {e}")
             st.error("Error loading lab templates")
     
-    def _filter_devices(self, devices: List[Dict], device_type: str, status: str, search: str) -> List[Dict]:
-        """Filter devices based on criteria"""
-        filtered = devices
+    def _filter_devices(self, devices: pd.DataFrame, device_type: str, status: str, search: str,
+                        search_index: Optional[pd.DataFrame] = None) -> List[Dict]:
+        """Filter devices based on criteria using vectorized column masks"""
+        mask = pd.Series(True, index=devices.index)
         
-        # Filter by device type
         if device_type != 'All':
-            filtered = [d for d in filtered if d.get('device_type') == device_type]
+            mask &= devices['device_type'].eq(device_type)
         
-        # Filter by status
         if status != 'All':
-            filtered = [d for d in filtered if d.get('status') == status]
+            mask &= devices['status'].eq(status)
         
-        # Filter by search term
         if search:
             search = search.lower()
-            filtered = [d for d in filtered 
-                       if search in d.get('hostname', '').lower() 
-                       or search in d.get('ip_address', '').lower()]
+            if search_index is None:
+                search_index = devices[['hostname', 'ip_address']].fillna('').astype(str).apply(
+                    lambda col: col.str.lower()
+                )
+            mask &= (search_index['hostname'].str.contains(search, regex=False)
+                     | search_index['ip_address'].str.contains(search, regex=False))
         
-        return filtered
+        # Match the unfiltered path (raw device dicts): missing values are None, not NaN
+        return devices[mask].replace({np.nan: None}).to_dict('records')
     
     def _setup_lab_devices(self, device_manager):
         """Setup default lab devices"""
         try:
             with show_loading_spinner("Setting up lab devices..."):
                 ensure_default_lab_devices(device_manager)
+            bump_inventory_version()
             
             st.success("✅ Lab devices setup completed!")
             notification_manager.add_notification(
@@ -325,21 +511,14 @@ class DevicesPage:
     def _run_health_check_all(self, device_manager):
         """Run health check on all devices"""
         try:
-            devices = device_manager.get_all_devices()
+            devices = _cached_get_all_devices(device_manager, inventory_version())
             
             with show_loading_spinner("Running health checks on all devices..."):
+                # Port probes are network-bound, so run them concurrently
                 results = []
-                for device in devices:
-                    host = device.get('ip_address', '').split(':')[0]
-                    port = int(device.get('ssh_port', 22))
-                    
-                    is_reachable = self.performance_monitor.check_port_availability(host, port, timeout=2)
-                    
-                    results.append({
-                        'hostname': device['hostname'],
-                        'success': is_reachable,
-                        'message': 'Reachable' if is_reachable else 'Not reachable'
-                    })
+                if devices:
+                    with ThreadPoolExecutor(max_workers=min(64, len(devices))) as executor:
+                        results = list(executor.map(self._probe_device, devices))
                 
                 st.session_state.bulk_health_results = results
             
@@ -354,21 +533,31 @@ class DevicesPage:
             logger.error(f"❌ Error running health check: {e}")
             st.error(f"Error running health check: {e}")
     
+    def _probe_device(self, device: Dict[str, Any]) -> Dict[str, Any]:
+        """Check SSH port reachability for a single device"""
+        host = device.get('ip_address', '').split(':')[0]
+        port = int(device.get('ssh_port', 22))
+        
+        is_reachable = self.performance_monitor.check_port_availability(host, port, timeout=2)
+        
+        return {
+            'hostname': device['hostname'],
+            'success': is_reachable,
+            'message': 'Reachable' if is_reachable else 'Not reachable'
+        }
+    
     def _export_devices_csv(self, device_manager):
         """Export devices to CSV"""
         try:
-            devices = device_manager.get_all_devices()
+            devices = _cached_get_all_devices(device_manager, inventory_version())
             if not devices:
                 st.warning("No devices to export")
                 return
             
-            df = pd.DataFrame(devices)
-            csv = df.to_csv(index=False)
-            
             st.download_button(
                 label="📥 Download CSV",
-                data=csv,
-                file_name=f"devices_export_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv",
+                data=_devices_csv_bytes(device_manager, inventory_version()),
+                file_name=f"devices_export_{datetime.now():%Y%m%d_%H%M%S}.csv",
                 mime="text/csv"
             )
             
@@ -376,6 +565,49 @@ class DevicesPage:
             logger.error(f"❌ Error exporting CSV: {e}")
             st.error(f"Error exporting CSV: {e}")
     
+    def _import_devices_csv(self, uploaded_file, device_manager):
+        """Import devices from an uploaded CSV, reading and inserting it in chunks"""
+        imported = 0
+        errors = []
+        progress = st.progress(0.0)
+        total_bytes = max(uploaded_file.size, 1)
+        
+        try:
+            reader = pd.read_csv(uploaded_file, chunksize=CSV_IMPORT_CHUNK_SIZE, dtype=str, keep_default_na=False)
+            for chunk_index, chunk in enumerate(reader):
+                if chunk_index == 0:
+                    missing = [c for c in CSV_IMPORT_REQUIRED_COLUMNS if c not in chunk.columns]
+                    if missing:
+                        st.error(f"❌ CSV is missing required columns: {', '.join(missing)}")
+                        return
+                
+                # Empty cells fall back to the device manager defaults
+                records = [{k: v for k, v in row.items() if v != ''} for row in chunk.to_dict('records')]
+                result = device_manager.add_devices(records)
+                imported += len(result['added'])
+                errors.extend(f"{error['hostname']}: {error['error']}" for error in result['errors'])
+
+                progress.progress(min(uploaded_file.tell() / total_bytes, 1.0))
+            
+            progress.progress(1.0)
+            
+        except Exception as e:
+            logger.error(f"❌ Error importing CSV: {e}")
+            st.error(f"Error importing CSV: {e}")
+        
+        finally:
+            if imported:
+                bump_inventory_version()
+        
+        if imported:
+            st.success(f"✅ Imported {imported} device(s)")
+            notification_manager.add_notification(f"Imported {imported} devices from CSV", "success")
+        if errors:
+            st.warning(f"⚠️ {len(errors)} row(s) failed to import")
+            with st.expander("Import errors"):
+                for error in errors:
+                    st.write(f"- {error}")
+    
     def _update_device_status(self, device: Dict[str, Any], device_manager):
         """Update device status"""
         try:
@@ -387,6 +619,7 @@ class DevicesPage:
                 new_status = 'online' if is_reachable else 'offline'
                 
                 device_manager.update_device_status(device['id'], new_status)
+            bump_inventory_version()
             
             st.success(f"✅ Device status updated to: {new_status}")
             st.rerun()
@@ -404,6 +637,7 @@ class DevicesPage:
             if st.button("✅ Yes, Delete", type="primary"):
                 try:
                     device_manager.delete_device(device['id'])
+                    bump_inventory_version()
                     st.success(f"✅ Device {device['hostname']} deleted")
                     st.rerun()
                 except Exception as e:
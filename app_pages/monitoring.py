@@ -6,12 +6,15 @@ Monitoring Page - Real-time Network Performance and Availability Monitoring
 import streamlit as st
 import pandas as pd
 import numpy as np
+import gzip
+import json
+import time
 from datetime import datetime, timedelta
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Callable, Tuple
+from concurrent.futures import ThreadPoolExecutor
+from collections import Counter
+from operator import itemgetter
 import logging
-import plotly.graph_objects as go
-import plotly.express as px
-from plotly.subplots import make_subplots
 
 # Import our modular components
 from components.forms import device_selector
@@ -20,12 +23,154 @@ from components.metrics import monitoring_metrics_row
 from utils.shared_utils import (
     PerformanceMonitor,
     notification_manager,
-    show_loading_spinner
+    fragment,
+    inventory_version
 )
 from utils.data_processing import DataProcessor
 
 logger = logging.getLogger(__name__)
 
+
+REFRESH_INTERVALS = {"5s": 5, "15s": 15, "30s": 30, "1m": 60}
+TREND_MAX_POINTS = 1000
+# Alert rule exports with more rules than this are downloaded gzip-compressed
+ALERT_RULES_GZIP_THRESHOLD = 100
+
+_REPORT_TEMPLATES = (
+    "Executive Summary Report",
+    "Technical Performance Report",
+    "SLA Compliance Report",
+    "Incident Summary Report"
+)
+
+_SCHEDULED_REPORTS_DF = pd.DataFrame([
+    {"name": "Daily Availability Report", "frequency": "Daily", "next_run": "Tomorrow 06:00"},
+    {"name": "Weekly SLA Report", "frequency": "Weekly", "next_run": "Monday 08:00"}
+])
+
+_PREVIEW_MD = """
+**Executive Summary:**
+- Network availability: 99.5%
+- Average response time: 45ms
+- Total alerts: 12 (2 critical, 5 high, 5 medium)
+
+**Key Findings:**
+- Router-01 experienced intermittent connectivity issues
+- Switch-02 performance improved after maintenance
+- Overall network performance within SLA targets
+"""
+
+# One PCG64 generator for all simulated values (faster than the legacy global np.random state)
+_rng = np.random.default_rng()
+
+_STATUS_BADGES = {'online': '🟢 online', 'offline': '🔴 offline'}
+
+_STATUS_PIE_COLORS = {
+    'online': '#28a745',
+    'offline': '#dc3545',
+    'warning': '#ffc107',
+    'unknown': '#6c757d'
+}
+# Availability chart trace order and colors
+_STATUS_BAR_COLORS = {'online': 'green', 'warning': 'orange', 'offline': 'red'}
+
+MONITORING_COLUMNS = (
+    'hostname', 'ip_address', 'device_type', 'status',
+    'response_time', 'packet_loss', 'uptime', 'last_seen'
+)
+
+
+@st.cache_data(ttl=30, show_spinner=False)
+def _load_devices(_device_manager, version: int) -> List[Dict[str, Any]]:
+    """Load all devices once per inventory version (shared by every tab in a render pass)"""
+    return _device_manager.get_all_devices()
+
+
+@st.cache_data(ttl=5, show_spinner=False)
+def _load_monitoring_data(_network_monitor, devices: tuple) -> Dict[str, List[Any]]:
+    """Current monitoring data, one list per column, for (id, hostname, ip_address, device_type) device tuples"""
+    cols = {column: [] for column in MONITORING_COLUMNS}
+    
+    try:
+        device_ids = [device[0] for device in devices]
+        
+        # Status checks are network-bound, so overlap them when the monitor allows it
+        if device_ids and getattr(_network_monitor, 'thread_safe', False):
+            with ThreadPoolExecutor(max_workers=min(32, len(device_ids))) as executor:
+                statuses = list(executor.map(_network_monitor.get_device_status, device_ids))
+        else:
+            statuses = [_network_monitor.get_device_status(device_id) for device_id in device_ids]
+        
+        for (device_id, hostname, ip_address, device_type), status_data in zip(devices, statuses):
+            cols['hostname'].append(hostname)
+            cols['ip_address'].append(ip_address)
+            cols['device_type'].append(device_type)
+            cols['status'].append(status_data.get('status', 'unknown'))
+            cols['response_time'].append(status_data.get('response_time', 0))
+            cols['packet_loss'].append(status_data.get('packet_loss', 0))
+            cols['uptime'].append(status_data.get('uptime', 'Unknown'))
+            cols['last_seen'].append(status_data.get('last_seen', 'Never'))
+        
+        return cols
+        
+    except Exception as e:
+        logger.error(f"❌ Error getting monitoring data: {e}")
+        return {column: [] for column in MONITORING_COLUMNS}
+
+
+@st.cache_data(ttl=5, show_spinner=False)
+def _load_active_alerts(_network_monitor) -> List[Dict[str, Any]]:
+    """Active alerts (cached briefly, shared by the alert list and the mute guard)"""
+    return _network_monitor.get_active_alerts()
+
+
+def _simulated(slot: str, key: Any, draw: Callable[[np.random.Generator], Any]) -> Any:
+    """Placeholder values for a chart with no data source yet, redrawn only when key changes (None with real data on)"""
+    if st.session_state.get('use_real_data'):
+        return None
+    cache = st.session_state.setdefault('_sim_cache', {})
+    if slot not in cache or cache[slot][0] != key:
+        cache[slot] = (key, draw(_rng))
+    return cache[slot][1]
+
+
+@st.cache_data(ttl=60, show_spinner=False)
+def _serialize_alert_rules(_network_monitor) -> Optional[Tuple[bytes, str, str]]:
+    """Alert rules as a compact JSON export payload, filename and mime type (gzipped for large rule sets)"""
+    rules = _network_monitor.get_alert_rules()
+    if not rules:
+        return None
+    payload = json.dumps(rules, separators=(",", ":"), default=str).encode("utf-8")
+    file_name = f"alert_rules_{datetime.now():%Y%m%d_%H%M%S}.json"
+    if len(rules) > ALERT_RULES_GZIP_THRESHOLD:
+        return gzip.compress(payload), f"{file_name}.gz", "application/gzip"
+    return payload, file_name, "application/json"
+
+
+def _clear_monitoring_caches():
+    """Drop cached devices and status data so the next run fetches fresh values"""
+    _load_devices.clear()
+    _load_monitoring_data.clear()
+
+
+# (id, hostname, ip_address, device_type) for a device dict, extracted in C
+_device_key = itemgetter('id', 'hostname', 'ip_address', 'device_type')
+
+
+def _monitoring_content_key(monitoring_data: Dict[str, List[Any]]) -> tuple:
+    """Hashable snapshot of the monitoring values the live charts are built from"""
+    return tuple(zip(monitoring_data['hostname'], monitoring_data['status'], monitoring_data['response_time']))
+
+
+def _cached_fig(key: str, content_key: tuple, builder: Callable, *args):
+    """Figure from builder(previous_fig, *args), rebuilt only when content_key changes"""
+    content_hash = hash(content_key)
+    if st.session_state.get(f'fig_{key}_hash') != content_hash or f'fig_{key}' not in st.session_state:
+        st.session_state[f'fig_{key}'] = builder(st.session_state.get(f'fig_{key}'), *args)
+        st.session_state[f'fig_{key}_hash'] = content_hash
+    return st.session_state[f'fig_{key}']
+
+
 class MonitoringPage:
     """Real-time network monitoring and performance analysis page"""
     
@@ -52,24 +197,27 @@ class MonitoringPage:
             st.error("❌ Device manager not initialized")
             return
         
-        # Monitoring tabs
-        tab1, tab2, tab3, tab4 = st.tabs([
-            "📊 Real-time Dashboard", 
-            "📈 Performance Analysis", 
-            "🚨 Alerts & Thresholds",
-            "📋 Reports"
-        ])
+        # Monitoring sections (only the selected one runs, so the live auto-refresh stops on other sections)
+        active_section = st.radio(
+            "Section",
+            [
+                "📊 Real-time Dashboard", 
+                "📈 Performance Analysis", 
+                "🚨 Alerts & Thresholds",
+                "📋 Reports"
+            ],
+            horizontal=True,
+            label_visibility="collapsed",
+            key="monitoring_tab"
+        )
         
-        with tab1:
+        if active_section == "📊 Real-time Dashboard":
             self._render_realtime_dashboard(network_monitor, device_manager)
-        
-        with tab2:
+        elif active_section == "📈 Performance Analysis":
             self._render_performance_analysis(network_monitor, device_manager)
-        
-        with tab3:
+        elif active_section == "🚨 Alerts & Thresholds":
             self._render_alerts_thresholds(network_monitor, device_manager)
-        
-        with tab4:
+        else:
             self._render_reports(network_monitor, device_manager)
     
     def _render_realtime_dashboard(self, network_monitor, device_manager):
@@ -77,7 +225,7 @@ class MonitoringPage:
         st.markdown("### 📊 Real-time Network Status")
         
         # Auto-refresh controls
-        col1, col2, col3, col4 = st.columns(4)
+        col1, col2, col3 = st.columns(3)
         
         with col1:
             auto_refresh = st.checkbox("🔄 Auto Refresh", value=True)
@@ -86,21 +234,28 @@ class MonitoringPage:
             refresh_interval = st.selectbox("Interval:", ["5s", "15s", "30s", "1m"], index=2)
         
         with col3:
-            if st.button("🔄 Refresh Now", type="primary"):
-                st.rerun()
+            st.button("🔄 Refresh Now", type="primary", on_click=_clear_monitoring_caches)
         
-        with col4:
-            # Show last update time
-            current_time = datetime.now().strftime('%H:%M:%S')
-            st.caption(f"Last Update: {current_time}")
+        # Auto-refresh reruns only the status fragment on a timer instead of sleeping the script
+        run_every = REFRESH_INTERVALS[refresh_interval] if auto_refresh else None
+        fragment(run_every=run_every)(self._render_realtime_status)(network_monitor, device_manager)
+    
+    def _render_realtime_status(self, network_monitor, device_manager):
+        """Render the live status section of the real-time dashboard"""
+        # Show last update time (refreshed at most once a second so the caption stays stable between reruns)
+        now = time.monotonic()
+        if '_last_update_str' not in st.session_state or now - st.session_state['_last_update_ts'] >= 1.0:
+            st.session_state['_last_update_ts'] = now
+            st.session_state['_last_update_str'] = datetime.now().strftime('%H:%M:%S')
+        st.caption(f"Last Update: {st.session_state['_last_update_str']}")
         
         # Network overview metrics
         try:
-            devices = device_manager.get_all_devices()
+            devices = _load_devices(device_manager, inventory_version())
             monitoring_data = self._get_monitoring_data(network_monitor, devices)
             
             # Overview metrics
-            monitoring_metrics_row(monitoring_data)
+            monitoring_metrics_row(self._summarize_monitoring_data(monitoring_data))
             
             # Network topology status
             st.markdown("### 🌐 Network Status Map")
@@ -119,33 +274,23 @@ class MonitoringPage:
             
             # Device status table
             st.markdown("### 📋 Device Status Details")
-            if monitoring_data:
-                df = pd.DataFrame(monitoring_data)
+            if monitoring_data['hostname']:
+                df = pd.DataFrame(monitoring_data, copy=False)
                 
-                # Color-code status
-                def style_status(val):
-                    if val == 'online':
-                        return 'background-color: #d4edda; color: #155724'
-                    elif val == 'offline':
-                        return 'background-color: #f8d7da; color: #721c24'
-                    else:
-                        return 'background-color: #fff3cd; color: #856404'
-                
-                styled_df = df.style.applymap(style_status, subset=['status'])
-                st.dataframe(styled_df, use_container_width=True)
+                # Status badges go out with the Arrow table instead of per-cell Styler HTML
+                status = df['status'].astype(str)
+                df['status'] = status.map(_STATUS_BADGES).fillna('🟡 ' + status)
+                st.dataframe(
+                    df,
+                    use_container_width=True,
+                    column_config={'status': st.column_config.TextColumn('Status')}
+                )
             else:
                 st.info("No monitoring data available")
             
         except Exception as e:
             logger.error(f"❌ Error loading monitoring dashboard: {e}")
             st.error("Error loading monitoring dashboard")
-        
-        # Auto-refresh implementation
-        if auto_refresh:
-            import time
-            refresh_seconds = {"5s": 5, "15s": 15, "30s": 30, "1m": 60}[refresh_interval]
-            time.sleep(refresh_seconds)
-            st.rerun()
     
     def _render_performance_analysis(self, network_monitor, device_manager):
         """Render performance analysis interface"""
@@ -168,7 +313,7 @@ class MonitoringPage:
             )
         
         with col3:
-            devices = device_manager.get_all_devices()
+            devices = _load_devices(device_manager, inventory_version())
             if devices:
                 device_filter = st.selectbox(
                     "Device:",
@@ -205,6 +350,9 @@ class MonitoringPage:
         st.markdown("### 🚨 Alerts & Thresholds")
         st.markdown("Configure monitoring thresholds and manage alerts")
         
+        # One placeholder for save/mute errors, updated in place instead of adding a new block per failure
+        status_slot = st.empty()
+        
         # Alert controls
         col1, col2, col3, col4 = st.columns(4)
         
@@ -218,7 +366,7 @@ class MonitoringPage:
         
         with col3:
             if st.button("🔕 Mute All", use_container_width=True):
-                self._mute_all_alerts(network_monitor)
+                self._mute_all_alerts(network_monitor, status_slot)
         
         with col4:
             if st.button("📤 Export Rules", use_container_width=True):
@@ -226,12 +374,12 @@ class MonitoringPage:
         
         # Alert rule editor
         if st.session_state.get('show_alert_editor', False):
-            self._render_alert_rule_editor(network_monitor, device_manager)
+            self._render_alert_rule_editor(network_monitor, device_manager, status_slot)
         
         # Active alerts
         st.markdown("### 🚨 Active Alerts")
         try:
-            active_alerts = network_monitor.get_active_alerts()
+            active_alerts = _load_active_alerts(network_monitor)
             
             if active_alerts:
                 # Alert summary
@@ -258,7 +406,7 @@ class MonitoringPage:
         
         # Threshold configuration
         st.markdown("### ⚙️ Threshold Configuration")
-        self._render_threshold_configuration(network_monitor, device_manager)
+        self._render_threshold_configuration(network_monitor, device_manager, status_slot)
         
         # Alert history
         st.markdown("### 📋 Alert History")
@@ -325,133 +473,122 @@ class MonitoringPage:
         self._render_scheduled_reports(network_monitor)
     
     def _get_monitoring_data(self, network_monitor, devices):
-        """Get current monitoring data for all devices"""
-        try:
-            monitoring_data = []
-            
-            for device in devices:
-                # Get latest monitoring data
-                status_data = network_monitor.get_device_status(device['id'])
-                
-                device_data = {
-                    'hostname': device['hostname'],
-                    'ip_address': device['ip_address'],
-                    'device_type': device['device_type'],
-                    'status': status_data.get('status', 'unknown'),
-                    'response_time': status_data.get('response_time', 0),
-                    'packet_loss': status_data.get('packet_loss', 0),
-                    'uptime': status_data.get('uptime', 'Unknown'),
-                    'last_seen': status_data.get('last_seen', 'Never')
-                }
-                monitoring_data.append(device_data)
-            
-            return monitoring_data
-            
-        except Exception as e:
-            logger.error(f"❌ Error getting monitoring data: {e}")
-            return []
+        """Get current monitoring data for all devices (cached for a few seconds across reruns)"""
+        device_keys = tuple(map(_device_key, devices))
+        return _load_monitoring_data(network_monitor, device_keys)
+    
+    def _summarize_monitoring_data(self, monitoring_data: Dict[str, List[Any]]) -> Dict[str, Any]:
+        """Overview metrics for monitoring_metrics_row"""
+        total = len(monitoring_data['hostname'])
+        online = monitoring_data['status'].count('online')
+        response_times = [rt for rt in monitoring_data['response_time'] if rt is not None]
+        
+        return {
+            'monitored_devices': total,
+            'avg_response_time': sum(response_times) / len(response_times) if response_times else 0,
+            'uptime_percent': online / total * 100 if total else 0
+        }
     
     def _render_network_status_map(self, monitoring_data):
         """Render network status visualization"""
         try:
-            if not monitoring_data:
+            if not monitoring_data['hostname']:
                 st.info("No monitoring data available for network map")
                 return
             
-            # Create status summary
-            status_counts = {}
-            for device in monitoring_data:
-                status = device['status']
-                status_counts[status] = status_counts.get(status, 0) + 1
-            
-            # Create pie chart
-            fig = px.pie(
-                values=list(status_counts.values()),
-                names=list(status_counts.keys()),
-                title="Network Device Status Distribution",
-                color_discrete_map={
-                    'online': '#28a745',
-                    'offline': '#dc3545',
-                    'warning': '#ffc107',
-                    'unknown': '#6c757d'
-                }
-            )
-            
-            st.plotly_chart(fig, use_container_width=True)
+            fig = _cached_fig('status_map', _monitoring_content_key(monitoring_data),
+                              self._build_status_map_figure, monitoring_data)
+            st.plotly_chart(fig, use_container_width=True, key='status_map_chart')
             
         except Exception as e:
             logger.error(f"❌ Error rendering network status map: {e}")
             st.error("Error rendering network status map")
     
+    def _build_status_map_figure(self, fig, monitoring_data):
+        """Build the device status pie chart"""
+        import plotly.express as px
+        
+        # Create status summary
+        status_counts = {}
+        for status in monitoring_data['status']:
+            status_counts[status] = status_counts.get(status, 0) + 1
+        
+        # Create pie chart
+        return px.pie(
+            values=list(status_counts.values()),
+            names=list(status_counts.keys()),
+            title="Network Device Status Distribution",
+            color_discrete_map=_STATUS_PIE_COLORS
+        )
+    
     def _render_response_time_chart(self, monitoring_data):
         """Render response time chart"""
         try:
-            if not monitoring_data:
+            if not monitoring_data['hostname']:
                 st.info("No response time data available")
                 return
             
-            # Create response time chart
-            hostnames = [d['hostname'] for d in monitoring_data]
-            response_times = [d['response_time'] for d in monitoring_data]
-            
-            fig = go.Figure(data=[
-                go.Bar(
-                    x=hostnames,
-                    y=response_times,
-                    marker_color=['red' if rt > 100 else 'orange' if rt > 50 else 'green' for rt in response_times]
-                )
-            ])
+            fig = _cached_fig('response_time', _monitoring_content_key(monitoring_data),
+                              self._build_response_time_figure, monitoring_data)
+            st.plotly_chart(fig, use_container_width=True, key='rt_chart')
             
+        except Exception as e:
+            logger.error(f"❌ Error rendering response time chart: {e}")
+            st.error("Error rendering response time chart")
+    
+    def _build_response_time_figure(self, fig, monitoring_data):
+        """Build (or update in place) the response time bar chart"""
+        import plotly.graph_objects as go
+        
+        hostnames = monitoring_data['hostname']
+        response_times = monitoring_data['response_time']
+        
+        rt = np.asarray(response_times, dtype=float)
+        colors = np.select([rt > 100, rt > 50], ['red', 'orange'], default='green').tolist()
+        
+        if fig is None:
+            fig = go.Figure(data=[go.Bar()])
             fig.update_layout(
                 title="Device Response Times (ms)",
                 xaxis_title="Device",
                 yaxis_title="Response Time (ms)",
                 height=400
             )
-            
-            st.plotly_chart(fig, use_container_width=True)
-            
-        except Exception as e:
-            logger.error(f"❌ Error rendering response time chart: {e}")
-            st.error("Error rendering response time chart")
+        
+        fig.data[0].update(x=hostnames, y=response_times, marker_color=colors)
+        return fig
     
     def _render_availability_chart(self, monitoring_data):
         """Render availability status chart"""
         try:
-            if not monitoring_data:
+            if not monitoring_data['hostname'] or st.session_state.get('use_real_data'):
                 st.info("No availability data available")
                 return
             
-            # Calculate availability percentages (simulated)
-            availability_data = []
-            for device in monitoring_data:
-                # Simulate availability percentage based on status
-                if device['status'] == 'online':
-                    availability = np.random.uniform(95, 100)
-                elif device['status'] == 'warning':
-                    availability = np.random.uniform(85, 95)
-                else:
-                    availability = np.random.uniform(0, 85)
-                
-                availability_data.append({
-                    'hostname': device['hostname'],
-                    'availability': availability,
-                    'status': device['status']
-                })
+            fig = _cached_fig('availability', _monitoring_content_key(monitoring_data),
+                              self._build_availability_figure, monitoring_data)
+            st.plotly_chart(fig, use_container_width=True, key='availability_chart')
             
-            # Create availability chart
+        except Exception as e:
+            logger.error(f"❌ Error rendering availability chart: {e}")
+            st.error("Error rendering availability chart")
+    
+    def _build_availability_figure(self, fig, monitoring_data):
+        """Build (or update in place) the availability bar chart, one trace per status"""
+        import plotly.graph_objects as go
+        
+        hostnames = np.asarray(monitoring_data['hostname'])
+        statuses = np.asarray(monitoring_data['status'])
+        availability = _simulated('availability', tuple(monitoring_data['status']),
+                                  lambda rng: self._sample_availability(rng, statuses))
+        
+        if fig is None:
             fig = go.Figure()
-            
-            for status in ['online', 'warning', 'offline']:
-                status_data = [d for d in availability_data if d['status'] == status]
-                if status_data:
-                    fig.add_trace(go.Bar(
-                        x=[d['hostname'] for d in status_data],
-                        y=[d['availability'] for d in status_data],
-                        name=status.title(),
-                        marker_color={'online': 'green', 'warning': 'orange', 'offline': 'red'}[status]
-                    ))
-            
+            for status, color in _STATUS_BAR_COLORS.items():
+                fig.add_trace(go.Bar(
+                    name=status.title(),
+                    marker_color=color
+                ))
             fig.update_layout(
                 title="Device Availability (%)",
                 xaxis_title="Device",
@@ -460,15 +597,32 @@ class MonitoringPage:
                 height=400,
                 barmode='group'
             )
-            
-            st.plotly_chart(fig, use_container_width=True)
-            
-        except Exception as e:
-            logger.error(f"❌ Error rendering availability chart: {e}")
-            st.error("Error rendering availability chart")
+        
+        for trace, status in zip(fig.data, _STATUS_BAR_COLORS):
+            mask = statuses == status
+            trace.update(
+                x=hostnames[mask].tolist(),
+                y=availability[mask],
+                visible=bool(mask.any())
+            )
+        return fig
+    
+    def _sample_availability(self, rng: np.random.Generator, statuses: np.ndarray) -> np.ndarray:
+        """Simulated availability percentages, one draw per status bucket"""
+        online = statuses == 'online'
+        warning = statuses == 'warning'
+        other = ~(online | warning)
+        
+        availability = np.empty(len(statuses))
+        availability[online] = rng.uniform(95, 100, online.sum())
+        availability[warning] = rng.uniform(85, 95, warning.sum())
+        availability[other] = rng.uniform(0, 85, other.sum())
+        return availability
     
     def _render_performance_trends(self, network_monitor, time_range, metric_type, device_filter):
         """Render performance trend analysis"""
+        import plotly.graph_objects as go
+        
         try:
             # Generate sample trend data
             time_periods = {
@@ -480,34 +634,29 @@ class MonitoringPage:
             }
             
             minutes = time_periods.get(time_range, 1440)
-            intervals = min(100, minutes // 5)  # Max 100 data points
+            intervals = max(2, minutes // 5)  # One sample every 5 minutes
             
             # Generate time series
-            end_time = datetime.now()
-            start_time = end_time - timedelta(minutes=minutes)
-            time_range_data = pd.date_range(start=start_time, end=end_time, periods=intervals)
+            time_range_data = self._trend_time_axis(time_range, minutes, intervals)
             
             # Generate sample data based on metric type
-            if metric_type == "Response Time":
-                values = np.random.normal(50, 15, intervals)  # Average 50ms with variance
-                values = np.clip(values, 0, None)  # No negative response times
-                unit = "ms"
-            elif metric_type == "Packet Loss":
-                values = np.random.exponential(0.5, intervals)  # Exponential distribution
-                values = np.clip(values, 0, 100)  # 0-100%
-                unit = "%"
-            elif metric_type == "Uptime":
-                values = np.random.uniform(95, 100, intervals)  # High uptime
-                unit = "%"
-            else:
-                values = np.random.normal(50, 20, intervals)
-                unit = "%"
+            values = _simulated(
+                'trend', (time_range, metric_type, device_filter, time_range_data[-1]),
+                lambda rng: self._sample_trend_values(rng, metric_type, intervals)
+            )
+            if values is None:
+                st.info("Performance trend data not available")
+                return
+            unit = "ms" if metric_type == "Response Time" else "%"
+            
+            # Downsample long ranges to what the chart can actually show
+            keep = self.data_processor.lttb_indices(time_range_data.asi8, values, TREND_MAX_POINTS)
             
             # Create trend chart
             fig = go.Figure()
-            fig.add_trace(go.Scatter(
-                x=time_range_data,
-                y=values,
+            fig.add_trace(go.Scattergl(
+                x=time_range_data[keep],
+                y=values[keep],
                 mode='lines+markers',
                 name=f"{metric_type} ({device_filter})",
                 line=dict(width=2)
@@ -527,21 +676,48 @@ class MonitoringPage:
             logger.error(f"❌ Error rendering performance trends: {e}")
             st.error("Error rendering performance trends")
     
+    def _sample_trend_values(self, rng: np.random.Generator, metric_type: str, intervals: int) -> np.ndarray:
+        """Simulated trend series for a metric"""
+        if metric_type == "Response Time":
+            values = rng.normal(50, 15, intervals)  # Average 50ms with variance
+            return np.clip(values, 0, None)  # No negative response times
+        elif metric_type == "Packet Loss":
+            values = rng.exponential(0.5, intervals)  # Exponential distribution
+            return np.clip(values, 0, 100)  # 0-100%
+        elif metric_type == "Uptime":
+            return rng.uniform(95, 100, intervals)  # High uptime
+        else:
+            return rng.normal(50, 20, intervals)
+    
+    def _trend_time_axis(self, time_range: str, minutes: int, intervals: int) -> pd.DatetimeIndex:
+        """Trend x-axis, shared across metric switches until the next 5-minute sample boundary"""
+        end_time = pd.Timestamp.now().floor('5min')
+        key = f"_trend_x_{time_range}_{intervals}"
+        cached = st.session_state.get(key)
+        if cached is None or cached[0] != end_time:
+            start_time = end_time - timedelta(minutes=minutes)
+            cached = (end_time, pd.date_range(start=start_time, end=end_time, periods=intervals))
+            st.session_state[key] = cached
+        return cached[1]
+    
     def _render_performance_statistics(self, network_monitor, metric_type, device_filter):
         """Render performance statistics summary"""
         try:
             # Generate sample statistics
-            stats = {
-                'Average': np.random.uniform(45, 55),
-                'Minimum': np.random.uniform(10, 30),
-                'Maximum': np.random.uniform(80, 120),
-                'Std Dev': np.random.uniform(5, 15),
-                '95th Percentile': np.random.uniform(70, 90)
-            }
+            stats = _simulated('statistics', (metric_type, device_filter), lambda rng: {
+                'Average': rng.uniform(45, 55),
+                'Minimum': rng.uniform(10, 30),
+                'Maximum': rng.uniform(80, 120),
+                'Std Dev': rng.uniform(5, 15),
+                '95th Percentile': rng.uniform(70, 90)
+            })
+            if stats is None:
+                st.info("Performance statistics not available")
+                return
             
-            for stat_name, value in stats.items():
-                unit = "ms" if metric_type == "Response Time" else "%"
-                st.metric(stat_name, f"{value:.1f} {unit}")
+            unit = "ms" if metric_type == "Response Time" else "%"
+            for (stat_name, value), col in zip(stats.items(), st.columns(len(stats))):
+                col.metric(stat_name, f"{value:.1f} {unit}")
                 
         except Exception as e:
             st.info("Performance statistics not available")
@@ -556,7 +732,7 @@ class MonitoringPage:
                 'Packet Loss': {'target': 1.0, 'current': 0.3}
             }
             
-            for sla_name, data in sla_targets.items():
+            for (sla_name, data), col in zip(sla_targets.items(), st.columns(len(sla_targets))):
                 target = data['target']
                 current = data['current']
                 compliance = (current / target * 100) if target > 0 else 100
@@ -564,7 +740,7 @@ class MonitoringPage:
                 delta = current - target
                 delta_color = "normal" if delta <= 0 else "inverse"
                 
-                st.metric(
+                col.metric(
                     f"{sla_name} SLA",
                     f"{compliance:.1f}%",
                     delta=f"{delta:+.1f}",
@@ -615,7 +791,7 @@ class MonitoringPage:
         except Exception as e:
             st.info("Anomaly detection not available")
     
-    def _render_alert_rule_editor(self, network_monitor, device_manager):
+    def _render_alert_rule_editor(self, network_monitor, device_manager, status_slot):
         """Render alert rule editor"""
         st.markdown("### ➕ Create Alert Rule")
         
@@ -632,7 +808,7 @@ class MonitoringPage:
                 severity = st.selectbox("Severity:", ["Critical", "High", "Medium", "Low"])
                 notification_method = st.multiselect("Notifications:", ["Email", "SMS", "Webhook", "Dashboard"])
                 
-                devices = device_manager.get_all_devices()
+                devices = _load_devices(device_manager, inventory_version())
                 device_scope = st.selectbox(
                     "Apply to:",
                     ["All Devices"] + [d['hostname'] for d in devices] if devices else ["All Devices"]
@@ -644,17 +820,18 @@ class MonitoringPage:
             with col1:
                 if st.form_submit_button("💾 Save Rule", type="primary"):
                     self._save_alert_rule(network_monitor, rule_name, metric, condition, 
-                                        threshold, severity, notification_method, device_scope, description)
+                                        threshold, severity, notification_method, device_scope, description,
+                                        status_slot)
             
             with col2:
                 if st.form_submit_button("❌ Cancel"):
                     st.session_state.show_alert_editor = False
                     st.rerun()
     
-    def _render_threshold_configuration(self, network_monitor, device_manager):
+    def _render_threshold_configuration(self, network_monitor, device_manager, status_slot):
         """Render threshold configuration interface"""
         try:
-            devices = device_manager.get_all_devices()
+            devices = _load_devices(device_manager, inventory_version())
             
             if devices:
                 selected_device = device_selector(devices, key="threshold_device", label="Configure thresholds for:")
@@ -675,7 +852,8 @@ class MonitoringPage:
                     if st.button("💾 Save Thresholds"):
                         self._save_device_thresholds(
                             network_monitor, selected_device['id'],
-                            response_time_threshold, packet_loss_threshold, uptime_threshold, check_interval
+                            response_time_threshold, packet_loss_threshold, uptime_threshold, check_interval,
+                            status_slot
                         )
             else:
                 st.info("No devices available for threshold configuration")
@@ -708,8 +886,7 @@ class MonitoringPage:
             ]
             
             if history:
-                df = pd.DataFrame(history)
-                st.dataframe(df, use_container_width=True)
+                st.dataframe(history, use_container_width=True)
             else:
                 st.info("No alert history available")
                 
@@ -718,17 +895,11 @@ class MonitoringPage:
     
     def _count_alerts_by_severity(self, alerts):
         """Count alerts by severity level"""
-        counts = {'critical': 0, 'high': 0, 'medium': 0, 'low': 0}
-        
-        for alert in alerts:
-            severity = alert.get('severity', 'low').lower()
-            if severity in counts:
-                counts[severity] += 1
-        
-        return counts
+        counts = Counter(alert.get('severity', 'low').lower() for alert in alerts)
+        return {severity: counts.get(severity, 0) for severity in ('critical', 'high', 'medium', 'low')}
     
     def _save_alert_rule(self, network_monitor, name, metric, condition, threshold, 
-                        severity, notifications, device_scope, description):
+                        severity, notifications, device_scope, description, status_slot):
         """Save new alert rule"""
         try:
             rule_data = {
@@ -744,7 +915,8 @@ class MonitoringPage:
             }
             
             network_monitor.save_alert_rule(rule_data)
-            st.success(f"✅ Alert rule '{name}' created successfully")
+            _serialize_alert_rules.clear()
+            st.toast(f"✅ Alert rule '{name}' created successfully")
             st.session_state.show_alert_editor = False
             
             notification_manager.add_notification(
@@ -752,14 +924,12 @@ class MonitoringPage:
                 "success"
             )
             
-            st.rerun()
-            
         except Exception as e:
             logger.error(f"❌ Error saving alert rule: {e}")
-            st.error(f"Error saving alert rule: {e}")
+            status_slot.error(f"Error saving alert rule: {e}")
     
     def _save_device_thresholds(self, network_monitor, device_id, response_time, 
-                              packet_loss, uptime, check_interval):
+                              packet_loss, uptime, check_interval, status_slot):
         """Save device monitoring thresholds"""
         try:
             thresholds = {
@@ -770,20 +940,15 @@ class MonitoringPage:
             }
             
             network_monitor.save_device_thresholds(device_id, thresholds)
-            st.success("✅ Thresholds saved successfully")
+            st.toast("✅ Thresholds saved successfully")
             
         except Exception as e:
             logger.error(f"❌ Error saving thresholds: {e}")
-            st.error(f"Error saving thresholds: {e}")
+            status_slot.error(f"Error saving thresholds: {e}")
     
     def _generate_performance_analysis(self, network_monitor, time_range, metric_type, device_filter):
         """Generate performance analysis report"""
         try:
-            with show_loading_spinner("Generating performance analysis..."):
-                # Simulate analysis generation
-                import time
-                time.sleep(2)
-            
             st.success("✅ Performance analysis generated successfully")
             
             # Show sample analysis results
@@ -794,30 +959,33 @@ class MonitoringPage:
             logger.error(f"❌ Error generating performance analysis: {e}")
             st.error("Error generating performance analysis")
     
-    def _mute_all_alerts(self, network_monitor):
+    def _mute_all_alerts(self, network_monitor, status_slot):
         """Mute all active alerts"""
         try:
+            if not _load_active_alerts(network_monitor):
+                st.toast("No active alerts to mute")
+                return
+            
             network_monitor.mute_all_alerts()
-            st.success("✅ All alerts muted for 1 hour")
+            _load_active_alerts.clear()
+            st.toast("✅ All alerts muted for 1 hour")
             
         except Exception as e:
             logger.error(f"❌ Error muting alerts: {e}")
-            st.error("Error muting alerts")
+            status_slot.error("Error muting alerts")
     
     def _export_alert_rules(self, network_monitor):
         """Export alert rules configuration"""
         try:
-            rules = network_monitor.get_alert_rules()
+            export = _serialize_alert_rules(network_monitor)
             
-            if rules:
-                import json
-                rules_json = json.dumps(rules, indent=2, default=str)
-                
+            if export:
+                payload, file_name, mime = export
                 st.download_button(
                     label="📥 Download Alert Rules",
-                    data=rules_json,
-                    file_name=f"alert_rules_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json",
-                    mime="application/json"
+                    data=payload,
+                    file_name=file_name,
+                    mime=mime
                 )
             else:
                 st.warning("No alert rules available for export")
@@ -830,18 +998,13 @@ class MonitoringPage:
                                   include_charts, include_details, include_alerts, report_format):
         """Generate monitoring report"""
         try:
-            with show_loading_spinner(f"Generating {report_type}..."):
-                # Simulate report generation
-                import time
-                time.sleep(3)
-            
             st.success(f"✅ {report_type} generated successfully")
             
             # Provide download button
-            sample_data = f"Sample {report_type} data for {time_period}"
+            report_bytes = f"Sample {report_type} data for {time_period}".encode("utf-8")
             st.download_button(
                 label=f"📥 Download {report_type}",
-                data=sample_data,
+                data=report_bytes,
                 file_name=f"{report_type.lower().replace(' ', '_')}_{datetime.now().strftime('%Y%m%d')}.{report_format.lower()}",
                 mime="application/octet-stream"
             )
@@ -856,17 +1019,7 @@ class MonitoringPage:
         st.info(f"Report preview for {time_period}")
         
         # Sample report content
-        st.markdown("""
-        **Executive Summary:**
-        - Network availability: 99.5%
-        - Average response time: 45ms
-        - Total alerts: 12 (2 critical, 5 high, 5 medium)
-        
-        **Key Findings:**
-        - Router-01 experienced intermittent connectivity issues
-        - Switch-02 performance improved after maintenance
-        - Overall network performance within SLA targets
-        """)
+        st.markdown(_PREVIEW_MD)
     
     def _schedule_monitoring_report(self):
         """Schedule automated monitoring reports"""
@@ -880,39 +1033,37 @@ class MonitoringPage:
             if st.button("Save Schedule"):
                 st.success("Report schedule saved!")
     
+    @fragment
     def _render_report_templates(self, network_monitor):
         """Render report templates management"""
-        templates = [
-            "Executive Summary Report",
-            "Technical Performance Report", 
-            "SLA Compliance Report",
-            "Incident Summary Report"
-        ]
+        col1, col2, col3 = st.columns([3, 1, 1])
         
-        for template in templates:
-            col1, col2, col3 = st.columns([3, 1, 1])
-            
-            with col1:
-                st.write(f"📄 {template}")
-            
-            with col2:
-                if st.button("👁️ Preview", key=f"preview_{template}"):
-                    st.info(f"Preview of {template}")
-            
-            with col3:
-                if st.button("📊 Generate", key=f"generate_{template}"):
-                    st.success(f"{template} queued for generation")
+        with col1:
+            template = st.selectbox(
+                "Template",
+                _REPORT_TEMPLATES,
+                format_func=lambda t: f"📄 {t}",
+                label_visibility="collapsed",
+                key="report_template"
+            )
+        
+        with col2:
+            preview = st.button("👁️ Preview", key="tpl_preview", use_container_width=True)
+        
+        with col3:
+            generate = st.button("📊 Generate", key="tpl_generate", use_container_width=True)
+        
+        if preview:
+            st.info(f"Preview of {template}")
+        
+        if generate:
+            st.success(f"{template} queued for generation")
     
+    @fragment
     def _render_scheduled_reports(self, network_monitor):
         """Render scheduled reports list"""
-        scheduled = [
-            {"name": "Daily Availability Report", "frequency": "Daily", "next_run": "Tomorrow 06:00"},
-            {"name": "Weekly SLA Report", "frequency": "Weekly", "next_run": "Monday 08:00"}
-        ]
-        
-        if scheduled:
-            df = pd.DataFrame(scheduled)
-            st.dataframe(df, use_container_width=True)
+        if not _SCHEDULED_REPORTS_DF.empty:
+            st.dataframe(_SCHEDULED_REPORTS_DF, use_container_width=True)
         else:
             st.info("No scheduled reports configured")
 
@@ -6,14 +6,25 @@ Topology Page - Network Topology Visualization and Discovery
 import streamlit as st
 import pandas as pd
 import numpy as np
-from datetime import datetime
-from typing import Dict, Any, List, Optional
+from datetime import datetime, timedelta
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, List, Optional, Tuple
+import ipaddress
+import itertools
 import logging
+import math
 import plotly.graph_objects as go
 import plotly.express as px
 import networkx as nx
 from plotly.subplots import make_subplots
 
+try:
+    from scipy.sparse import csr_matrix
+    from scipy.sparse.csgraph import shortest_path
+except ImportError:
+    csr_matrix = shortest_path = None
+
 # Import our modular components
 from components.forms import device_selector
 from components.tables import topology_table, connection_table
@@ -21,12 +32,248 @@ from components.metrics import topology_metrics_row
 from utils.shared_utils import (
     PerformanceMonitor,
     notification_manager,
-    show_loading_spinner
+    show_loading_spinner,
+    fragment,
+    bump_inventory_version
 )
 from utils.data_processing import DataProcessor
 
 logger = logging.getLogger(__name__)
 
+
+def _topology_device_key(device: Dict[str, Any]) -> tuple:
+    """(id, hostname, device_type, ip_address, status) for a device dict"""
+    return (
+        device['id'],
+        device['hostname'],
+        device.get('device_type', 'unknown'),
+        device['ip_address'],
+        device.get('status', 'unknown')
+    )
+
+
+TOPOLOGY_NODE_COLUMNS = ('id', 'label', 'type', 'ip', 'status', 'x', 'y')
+TOPOLOGY_EDGE_COLUMNS = ('source', 'target', 'type', 'bandwidth', 'status')
+
+# Network map marker styling (unlisted statuses are gray, unlisted device types are circles)
+_NODE_STATUS_COLORS = {'online': 'green', 'offline': 'red', 'warning': 'orange'}
+_NODE_TYPE_SYMBOLS = {
+    'router': 'square',
+    'cisco_ios': 'square',
+    'switch': 'diamond',
+    'firewall': 'triangle-up'
+}
+
+# Fixed seed so force-directed layouts place the same devices in the same spots on every run
+_LAYOUT_SEED = 42
+
+
+def _spring_layout(graph: nx.Graph) -> Dict[Any, np.ndarray]:
+    """Fruchterman-Reingold positions (circular when SciPy is missing for large graphs)"""
+    try:
+        return nx.spring_layout(graph, seed=_LAYOUT_SEED)
+    except ImportError:
+        return nx.circular_layout(graph)
+
+
+def _force_directed_layout(graph: nx.Graph) -> Dict[Any, np.ndarray]:
+    """Fruchterman-Reingold positions run to a tighter convergence than the spring layout"""
+    try:
+        return nx.spring_layout(graph, seed=_LAYOUT_SEED, iterations=200)
+    except ImportError:
+        return nx.circular_layout(graph)
+
+
+def _hierarchical_layout(graph: nx.Graph) -> Dict[Any, np.ndarray]:
+    """Rows by hop count from the first device of each connected component"""
+    layers = {}
+    for node in graph:
+        if node not in layers:
+            layers.update(nx.single_source_shortest_path_length(graph, node))
+    nx.set_node_attributes(graph, layers, 'layer')
+    return nx.multipartite_layout(graph, subset_key='layer', align='horizontal')
+
+
+def _grid_layout(graph: nx.Graph) -> Dict[Any, np.ndarray]:
+    """Devices on a square grid in inventory order"""
+    columns = max(1, math.ceil(math.sqrt(len(graph))))
+    return {node: np.array([i % columns, -(i // columns)], dtype=np.float64) for i, node in enumerate(graph)}
+
+
+_TOPOLOGY_LAYOUTS = {
+    'Spring': _spring_layout,
+    'Circular': nx.circular_layout,
+    'Hierarchical': _hierarchical_layout,
+    'Grid': _grid_layout,
+    'Force-directed': _force_directed_layout
+}
+
+
+def _csr_adjacency(sources: np.ndarray, targets: np.ndarray, node_count: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Symmetric (indptr, indices) CSR adjacency for undirected links between node rows"""
+    rows = np.concatenate([sources, targets])
+    cols = np.concatenate([targets, sources])
+    order = np.lexsort((cols, rows))
+    indptr = np.zeros(node_count + 1, dtype=np.int32)
+    np.cumsum(np.bincount(rows, minlength=node_count), out=indptr[1:])
+    return indptr, cols[order].astype(np.int32)
+
+
+def _empty_topology() -> Dict[str, Any]:
+    """Topology data with no nodes or edges"""
+    return {
+        'nodes': pd.DataFrame(columns=TOPOLOGY_NODE_COLUMNS),
+        'edges': pd.DataFrame(columns=TOPOLOGY_EDGE_COLUMNS),
+        'graph': nx.freeze(nx.Graph()),
+        'csr': _csr_adjacency(np.empty(0, dtype=np.int32), np.empty(0, dtype=np.int32), 0),
+        'metrics': {}
+    }
+
+
+@st.cache_data(max_entries=8, show_spinner=False)
+def _build_topology_data(devices: tuple, layout_type: str = "Spring") -> Dict[str, Any]:
+    """Topology nodes and edges (one DataFrame column per field), the frozen NetworkX graph and metrics
+    for (id, hostname, device_type, ip_address, status) device tuples, positioned by layout_type"""
+    try:
+        # Add nodes (devices)
+        nodes = pd.DataFrame(list(devices), columns=TOPOLOGY_NODE_COLUMNS[:5])
+        
+        # Add edges (connections) - sample chain through the devices
+        ids = nodes['id'].tolist()
+        links = list(zip(ids[:-1], ids[1:]))
+        
+        # Add an additional connection for a more realistic topology
+        if len(ids) > 2:
+            links.append((ids[0], ids[-1]))
+        
+        edges = pd.DataFrame(links, columns=['source', 'target'])
+        edges['type'] = 'ethernet'
+        edges['bandwidth'] = '1Gbps'
+        edges['status'] = 'active'
+        
+        # Position nodes with the selected NetworkX layout
+        graph = nx.Graph()
+        graph.add_nodes_from(ids)
+        graph.add_edges_from(links)
+        layout = _TOPOLOGY_LAYOUTS.get(layout_type, _spring_layout)
+        positions = layout(graph)
+        coords = np.array([positions[node_id] for node_id in ids], dtype=np.float64).reshape(-1, 2)
+        nodes['x'] = coords[:, 0]
+        nodes['y'] = coords[:, 1]
+        
+        # CSR adjacency over node rows for the array-based analyses
+        node_index = pd.Index(nodes['id'])
+        indptr, indices = _csr_adjacency(
+            node_index.get_indexer(edges['source']).astype(np.int32),
+            node_index.get_indexer(edges['target']).astype(np.int32),
+            len(nodes)
+        )
+        
+        # Calculate metrics
+        metrics = {
+            'total_nodes': len(nodes),
+            'total_edges': len(edges),
+            'network_diameter': len(devices),  # Simplified
+            'average_degree': len(indices) / len(nodes) if len(nodes) else 0
+        }
+        
+        # Frozen so the shared graph cannot be mutated by the analyzers that reuse it
+        return {
+            'nodes': nodes,
+            'edges': edges,
+            'graph': nx.freeze(graph),
+            'csr': (indptr, indices),
+            'metrics': metrics
+        }
+        
+    except Exception as e:
+        logger.error(f"❌ Error generating topology data: {e}")
+        return _empty_topology()
+
+
+def _probe_host(ip_address: ipaddress.IPv4Address, include_offline: bool) -> Dict[str, Any]:
+    """Simulated ping of one host"""
+    host_number = int(ip_address) & 0xFF
+    return {
+        'hostname': f'discovered-device-{host_number}',
+        'ip_address': str(ip_address),
+        'device_type': np.random.choice(['router', 'switch', 'server']),
+        'status': 'online' if include_offline or np.random.random() > 0.2 else 'offline',
+        'discovery_method': 'ping_sweep'
+    }
+
+
+@st.cache_data(ttl=300, show_spinner=False)
+def _cached_ping_sweep(network_range: str, include_offline: bool, concurrent_scans: int) -> List[Dict[str, Any]]:
+    """Simulated ping sweep results for a network range (without discovered_at), cached for 5 minutes"""
+    # Simulate finding devices at .2 to .9 (the first host is taken as the gateway)
+    hosts = list(itertools.islice(ipaddress.ip_network(network_range, strict=False).hosts(), 1, 9))
+    
+    # Probes are I/O-bound, so run up to concurrent_scans of them at once
+    with ThreadPoolExecutor(max_workers=max(1, min(concurrent_scans, len(hosts) or 1))) as executor:
+        return list(executor.map(_probe_host, hosts, itertools.repeat(include_offline)))
+
+
+@st.cache_data(ttl=300, show_spinner=False)
+def _cached_snmp_discovery(seed_device: str, deep_scan: bool) -> List[Dict[str, Any]]:
+    """Simulated SNMP neighbours of a seed device (without discovered_at), cached for 5 minutes"""
+    discovered = []
+    
+    # Simulate finding connected devices via SNMP
+    device_count = 5 if deep_scan else 3
+    
+    for i in range(1, device_count + 1):
+        device = {
+            'hostname': f'snmp-discovered-{i}',
+            'ip_address': f'192.168.1.{100 + i}',
+            'device_type': np.random.choice(['cisco_ios', 'cisco_nxos']),
+            'status': 'online',
+            'discovery_method': 'snmp',
+            'snmp_info': {
+                'sysName': f'Device-{i}',
+                'sysDescr': 'Cisco Router',
+                'sysUpTime': f'{np.random.randint(1, 365)} days'
+            }
+        }
+        discovered.append(device)
+    
+    return discovered
+
+
+@st.cache_data(max_entries=8, show_spinner=False)
+def _hop_distances(node_ids: tuple, links: tuple, _graph: nx.Graph, _csr: Tuple[np.ndarray, np.ndarray]) -> np.ndarray:
+    """All-pairs hop counts between node_ids (inf where unreachable), computed in one batch call"""
+    if shortest_path is not None:
+        indptr, indices = _csr
+        adjacency = csr_matrix((np.ones(len(indices)), indices, indptr), shape=(len(node_ids), len(node_ids)))
+        return shortest_path(adjacency, method='D', directed=False, unweighted=True)
+    
+    return nx.floyd_warshall_numpy(_graph, nodelist=list(node_ids))
+
+
+@st.cache_data(ttl=300, show_spinner=False)
+def _discovery_history_df() -> pd.DataFrame:
+    """Sample discovery history table (cached, rebuilt every 5 minutes)"""
+    now = datetime.now()
+    history = [
+        {
+            'timestamp': now.strftime('%Y-%m-%d %H:%M'),
+            'method': 'SNMP Discovery',
+            'devices_found': 5,
+            'devices_added': 3,
+            'duration': '2 minutes'
+        },
+        {
+            'timestamp': (now - timedelta(hours=24)).strftime('%Y-%m-%d %H:%M'),
+            'method': 'Ping Sweep',
+            'devices_found': 8,
+            'devices_added': 2,
+            'duration': '5 minutes'
+        }
+    ]
+    return pd.DataFrame(history)
+
+
 class TopologyPage:
     """Network topology visualization and discovery page"""
     
@@ -73,8 +320,8 @@ class TopologyPage:
         """Render interactive network topology map"""
         st.markdown("### 🗺️ Interactive Network Map")
         
-        # Map controls
-        col1, col2, col3, col4 = st.columns(4)
+        # Map controls (the display toggles live with the chart in _network_map_fragment)
+        col1, col2 = st.columns([3, 1])
         
         with col1:
             layout_type = st.selectbox(
@@ -83,14 +330,10 @@ class TopologyPage:
             )
         
         with col2:
-            show_labels = st.checkbox("Show Labels", value=True)
-        
-        with col3:
-            show_connections = st.checkbox("Show Connections", value=True)
-        
-        with col4:
             if st.button("🔄 Refresh Map", type="primary"):
-                st.session_state.topology_data = None
+                _build_topology_data.clear()
+                _cached_ping_sweep.clear()
+                _cached_snmp_discovery.clear()
                 st.rerun()
         
         # Generate topology map
@@ -101,17 +344,14 @@ class TopologyPage:
                 st.info("No devices available. Add devices to see network topology.")
                 return
             
-            # Get or generate topology data
-            if 'topology_data' not in st.session_state:
-                st.session_state.topology_data = self._generate_topology_data(devices, network_monitor)
-            
-            topology_data = st.session_state.topology_data
+            # Topology data is cached per device set, so reruns with unchanged devices skip the rebuild
+            topology_data = self._generate_topology_data(devices, network_monitor, layout_type)
             
             # Topology metrics overview
             topology_metrics_row(topology_data)
             
             # Render network visualization
-            self._render_network_visualization(topology_data, layout_type, show_labels, show_connections)
+            self._network_map_fragment(topology_data, layout_type)
             
             # Device details panel
             col1, col2 = st.columns([2, 1])
@@ -332,174 +572,47 @@ class TopologyPage:
                 }
             })
     
-    def _generate_topology_data(self, devices, network_monitor):
-        """Generate topology data from devices"""
-        try:
-            # Create sample topology connections
-            topology_data = {
-                'nodes': [],
-                'edges': [],
-                'metrics': {}
-            }
-            
-            # Add nodes (devices)
-            for i, device in enumerate(devices):
-                node = {
-                    'id': device['id'],
-                    'label': device['hostname'],
-                    'type': device.get('device_type', 'unknown'),
-                    'ip': device['ip_address'],
-                    'status': device.get('status', 'unknown'),
-                    'x': np.random.uniform(0, 10),
-                    'y': np.random.uniform(0, 10)
-                }
-                topology_data['nodes'].append(node)
-            
-            # Add edges (connections) - sample connections
-            if len(devices) > 1:
-                # Create a sample network topology
-                for i in range(len(devices) - 1):
-                    edge = {
-                        'source': devices[i]['id'],
-                        'target': devices[i + 1]['id'],
-                        'type': 'ethernet',
-                        'bandwidth': '1Gbps',
-                        'status': 'active'
-                    }
-                    topology_data['edges'].append(edge)
-                
-                # Add some additional connections for a more realistic topology
-                if len(devices) > 2:
-                    edge = {
-                        'source': devices[0]['id'],
-                        'target': devices[-1]['id'],
-                        'type': 'ethernet',
-                        'bandwidth': '1Gbps',
-                        'status': 'active'
-                    }
-                    topology_data['edges'].append(edge)
-            
-            # Calculate metrics
-            topology_data['metrics'] = {
-                'total_nodes': len(topology_data['nodes']),
-                'total_edges': len(topology_data['edges']),
-                'network_diameter': len(devices),  # Simplified
-                'average_degree': len(topology_data['edges']) * 2 / len(topology_data['nodes']) if topology_data['nodes'] else 0
-            }
-            
-            return topology_data
-            
-        except Exception as e:
-            logger.error(f"❌ Error generating topology data: {e}")
-            return {'nodes': [], 'edges': [], 'metrics': {}}
+    def _generate_topology_data(self, devices, network_monitor, layout_type="Spring"):
+        """Generate topology data from devices (cached per device set and layout)"""
+        return _build_topology_data(tuple(_topology_device_key(device) for device in devices), layout_type)
+    
+    @fragment
+    def _network_map_fragment(self, topology_data, layout_type):
+        """Network map with its display toggles (a toggle reruns only this block)"""
+        col1, col2 = st.columns(2)
+        
+        with col1:
+            show_labels = st.checkbox("Show Labels", value=True, key="topology_show_labels")
+        
+        with col2:
+            show_connections = st.checkbox("Show Connections", value=True, key="topology_show_connections")
+        
+        self._render_network_visualization(topology_data, layout_type, show_labels, show_connections)
     
     def _render_network_visualization(self, topology_data, layout_type, show_labels, show_connections):
         """Render network topology visualization using Plotly"""
         try:
-            if not topology_data['nodes']:
+            nodes = topology_data['nodes']
+            edges = topology_data['edges']
+            
+            if nodes.empty:
                 st.info("No topology data available")
                 return
             
-            # Create network graph
-            fig = go.Figure()
-            
-            # Add edges (connections) first so they appear behind nodes
-            if show_connections and topology_data['edges']:
-                edge_x = []
-                edge_y = []
-                
-                for edge in topology_data['edges']:
-                    source_node = next((n for n in topology_data['nodes'] if n['id'] == edge['source']), None)
-                    target_node = next((n for n in topology_data['nodes'] if n['id'] == edge['target']), None)
-                    
-                    if source_node and target_node:
-                        edge_x.extend([source_node['x'], target_node['x'], None])
-                        edge_y.extend([source_node['y'], target_node['y'], None])
-                
-                fig.add_trace(go.Scatter(
-                    x=edge_x, y=edge_y,
-                    mode='lines',
-                    line=dict(width=2, color='gray'),
-                    hoverinfo='none',
-                    showlegend=False,
-                    name='Connections'
-                ))
-            
-            # Add nodes
-            node_x = [node['x'] for node in topology_data['nodes']]
-            node_y = [node['y'] for node in topology_data['nodes']]
-            node_text = [node['label'] if show_labels else '' for node in topology_data['nodes']]
-            node_colors = []
-            node_symbols = []
-            
-            for node in topology_data['nodes']:
-                # Color by status
-                status = node.get('status', 'unknown')
-                if status == 'online':
-                    node_colors.append('green')
-                elif status == 'offline':
-                    node_colors.append('red')
-                elif status == 'warning':
-                    node_colors.append('orange')
-                else:
-                    node_colors.append('gray')
-                
-                # Symbol by device type
-                device_type = node.get('type', 'unknown')
-                if device_type in ['router', 'cisco_ios']:
-                    node_symbols.append('square')
-                elif device_type in ['switch']:
-                    node_symbols.append('diamond')
-                elif device_type in ['firewall']:
-                    node_symbols.append('triangle-up')
-                else:
-                    node_symbols.append('circle')
-            
-            # Create hover text
-            hover_text = []
-            for node in topology_data['nodes']:
-                hover_text.append(
-                    f"<b>{node['label']}</b><br>" +
-                    f"Type: {node.get('type', 'Unknown')}<br>" +
-                    f"IP: {node.get('ip', 'Unknown')}<br>" +
-                    f"Status: {node.get('status', 'Unknown')}"
-                )
-            
-            fig.add_trace(go.Scatter(
-                x=node_x, y=node_y,
-                mode='markers+text',
-                marker=dict(
-                    size=20,
-                    color=node_colors,
-                    symbol=node_symbols,
-                    line=dict(width=2, color='white')
-                ),
-                text=node_text,
-                textposition="bottom center",
-                hovertemplate='%{hovertext}<extra></extra>',
-                hovertext=hover_text,
-                showlegend=False,
-                name='Devices'
-            ))
-            
-            # Update layout
-            fig.update_layout(
-                title=f"Network Topology - {layout_type} Layout",
-                showlegend=True,
-                hovermode='closest',
-                margin=dict(b=20,l=5,r=5,t=40),
-                annotations=[ dict(
-                    text="Click and drag to pan, scroll to zoom",
-                    showarrow=False,
-                    xref="paper", yref="paper",
-                    x=0.005, y=-0.002,
-                    xanchor='left', yanchor='bottom',
-                    font=dict(color='gray', size=12)
-                )],
-                xaxis=dict(showgrid=False, zeroline=False, showticklabels=False),
-                yaxis=dict(showgrid=False, zeroline=False, showticklabels=False),
-                height=600
+            # Rebuild the traces only when the topology or layout changes; the label and
+            # connection toggles just flip attributes on the stored figure
+            content_key = (
+                layout_type,
+                int(pd.util.hash_pandas_object(nodes, index=False).sum()),
+                int(pd.util.hash_pandas_object(edges, index=False).sum())
             )
+            if st.session_state.get('topology_fig_key') != content_key or 'topology_fig' not in st.session_state:
+                st.session_state.topology_fig = self._build_network_figure(nodes, edges, layout_type)
+                st.session_state.topology_fig_key = content_key
+            
+            fig = st.session_state.topology_fig
+            fig.data[0].visible = show_connections
+            fig.data[1].mode = 'markers+text' if show_labels else 'markers'
             
             st.plotly_chart(fig, use_container_width=True)
             
@@ -507,6 +620,88 @@ class TopologyPage:
             logger.error(f"❌ Error rendering network visualization: {e}")
             st.error("Error rendering network visualization")
     
+    def _build_network_figure(self, nodes, edges, layout_type):
+        """Network topology figure with the connection trace first and the device trace second"""
+        xs = nodes['x'].to_numpy(dtype=np.float64)
+        ys = nodes['y'].to_numpy(dtype=np.float64)
+        
+        # Create network graph
+        fig = go.Figure()
+        
+        # Edge endpoints as node row positions (-1 for ids not in the node table)
+        node_index = pd.Index(nodes['id'])
+        sources = node_index.get_indexer(edges['source'])
+        targets = node_index.get_indexer(edges['target'])
+        known = (sources >= 0) & (targets >= 0)
+        sources, targets = sources[known], targets[known]
+        
+        # source, target, NaN gap per edge (Plotly breaks the line at NaN)
+        edge_x = np.full(3 * len(sources), np.nan)
+        edge_y = np.full(3 * len(sources), np.nan)
+        edge_x[0::3] = xs[sources]
+        edge_x[1::3] = xs[targets]
+        edge_y[0::3] = ys[sources]
+        edge_y[1::3] = ys[targets]
+        
+        # Add edges (connections) first so they appear behind nodes
+        fig.add_trace(go.Scatter(
+            x=edge_x, y=edge_y,
+            mode='lines',
+            line=dict(width=2, color='gray'),
+            hoverinfo='none',
+            showlegend=False,
+            name='Connections'
+        ))
+        
+        # Color by status, symbol by device type
+        node_colors = nodes['status'].map(_NODE_STATUS_COLORS).fillna('gray').tolist()
+        node_symbols = nodes['type'].map(_NODE_TYPE_SYMBOLS).fillna('circle').tolist()
+        
+        # Create hover text in one pass over the label/type/ip/status columns
+        hover_text = [
+            f"<b>{label}</b><br>Type: {device_type}<br>IP: {ip}<br>Status: {status}"
+            for label, device_type, ip, status in zip(nodes['label'], nodes['type'], nodes['ip'], nodes['status'])
+        ]
+        
+        # Add nodes
+        fig.add_trace(go.Scatter(
+            x=xs, y=ys,
+            mode='markers+text',
+            marker=dict(
+                size=20,
+                color=node_colors,
+                symbol=node_symbols,
+                line=dict(width=2, color='white')
+            ),
+            text=nodes['label'].tolist(),
+            textposition="bottom center",
+            hovertemplate='%{hovertext}<extra></extra>',
+            hovertext=hover_text,
+            showlegend=False,
+            name='Devices'
+        ))
+        
+        # Update layout
+        fig.update_layout(
+            title=f"Network Topology - {layout_type} Layout",
+            showlegend=True,
+            hovermode='closest',
+            margin=dict(b=20,l=5,r=5,t=40),
+            annotations=[ dict(
+                text="Click and drag to pan, scroll to zoom",
+                showarrow=False,
+                xref="paper", yref="paper",
+                x=0.005, y=-0.002,
+                xanchor='left', yanchor='bottom',
+                font=dict(color='gray', size=12)
+            )],
+            xaxis=dict(showgrid=False, zeroline=False, showticklabels=False),
+            yaxis=dict(showgrid=False, zeroline=False, showticklabels=False),
+            height=600
+        )
+        
+        return fig
+    
     def _render_connection_summary(self, topology_data):
         """Render connection summary statistics"""
         try:
@@ -518,11 +713,8 @@ class TopologyPage:
             st.metric("Avg Connections", f"{metrics.get('average_degree', 0):.1f}")
             
             # Connection types breakdown
-            if topology_data['edges']:
-                connection_types = {}
-                for edge in topology_data['edges']:
-                    conn_type = edge.get('type', 'unknown')
-                    connection_types[conn_type] = connection_types.get(conn_type, 0) + 1
+            if not topology_data['edges'].empty:
+                connection_types = Counter(topology_data['edges']['type'].fillna('unknown'))
                 
                 st.markdown("**Connection Types:**")
                 for conn_type, count in connection_types.items():
@@ -534,6 +726,13 @@ class TopologyPage:
     def _start_network_discovery(self, device_manager, method, network_range, seed_device, 
                                 include_offline, auto_add, deep_scan):
         """Start network discovery process"""
+        if method == "Ping Sweep" and network_range:
+            try:
+                ipaddress.ip_network(network_range, strict=False)
+            except ValueError:
+                st.error(f"Invalid network range: {network_range} (expected CIDR, e.g. 192.168.1.0/24)")
+                return
+        
         try:
             # Set discovery state
             st.session_state.discovery_running = True
@@ -568,48 +767,17 @@ class TopologyPage:
     
     def _simulate_ping_sweep(self, network_range, include_offline):
         """Simulate ping sweep discovery"""
-        # Generate sample discovered devices
-        discovered = []
-        
-        base_ip = network_range.split('/')[0].rsplit('.', 1)[0]
-        
-        for i in range(2, 10):  # Simulate finding devices at .2 to .9
-            device = {
-                'hostname': f'discovered-device-{i}',
-                'ip_address': f'{base_ip}.{i}',
-                'device_type': np.random.choice(['router', 'switch', 'server']),
-                'status': 'online' if include_offline or np.random.random() > 0.2 else 'offline',
-                'discovery_method': 'ping_sweep',
-                'discovered_at': datetime.now()
-            }
-            discovered.append(device)
-        
-        return discovered
+        concurrent_scans = st.session_state.get('topology_config', {}).get('discovery', {}).get('concurrent_scans', 10)
+        discovered_at = datetime.now()
+        return [
+            {**device, 'discovered_at': discovered_at}
+            for device in _cached_ping_sweep(network_range, include_offline, int(concurrent_scans))
+        ]
     
     def _simulate_snmp_discovery(self, seed_device, deep_scan):
         """Simulate SNMP-based discovery"""
-        discovered = []
-        
-        # Simulate finding connected devices via SNMP
-        device_count = 5 if deep_scan else 3
-        
-        for i in range(1, device_count + 1):
-            device = {
-                'hostname': f'snmp-discovered-{i}',
-                'ip_address': f'192.168.1.{100 + i}',
-                'device_type': np.random.choice(['cisco_ios', 'cisco_nxos']),
-                'status': 'online',
-                'discovery_method': 'snmp',
-                'snmp_info': {
-                    'sysName': f'Device-{i}',
-                    'sysDescr': 'Cisco Router',
-                    'sysUpTime': f'{np.random.randint(1, 365)} days'
-                },
-                'discovered_at': datetime.now()
-            }
-            discovered.append(device)
-        
-        return discovered
+        discovered_at = datetime.now()
+        return [{**device, 'discovered_at': discovered_at} for device in _cached_snmp_discovery(seed_device, deep_scan)]
     
     def _simulate_general_discovery(self, method):
         """Simulate other discovery methods"""
@@ -636,27 +804,10 @@ class TopologyPage:
     
     def _render_discovery_history(self, device_manager):
         """Render discovery history"""
-        # Sample discovery history
-        history = [
-            {
-                'timestamp': datetime.now().strftime('%Y-%m-%d %H:%M'),
-                'method': 'SNMP Discovery',
-                'devices_found': 5,
-                'devices_added': 3,
-                'duration': '2 minutes'
-            },
-            {
-                'timestamp': (datetime.now() - timedelta(hours=24)).strftime('%Y-%m-%d %H:%M'),
-                'method': 'Ping Sweep',
-                'devices_found': 8,
-                'devices_added': 2,
-                'duration': '5 minutes'
-            }
-        ]
+        history_df = _discovery_history_df()
         
-        if history:
-            df = pd.DataFrame(history)
-            st.dataframe(df, use_container_width=True)
+        if not history_df.empty:
+            st.dataframe(history_df, use_container_width=True)
         else:
             st.info("No discovery history available")
     
@@ -684,6 +835,7 @@ class TopologyPage:
                     if st.button("➕ Add", key=f"add_discovered_{device['hostname']}"):
                         try:
                             device_manager.add_device(device)
+                            bump_inventory_version()
                             st.success(f"✅ {device['hostname']} added to inventory")
                             # Remove from discovered list
                             st.session_state.discovered_devices.remove(device)
@@ -695,16 +847,20 @@ class TopologyPage:
     
     def _auto_add_discovered_devices(self, device_manager, discovered_devices):
         """Automatically add discovered devices to inventory"""
-        added_count = 0
+        try:
+            result = device_manager.add_devices(discovered_devices)
+        except Exception as e:
+            logger.error(f"❌ Error auto-adding discovered devices: {e}")
+            return
         
-        for device in discovered_devices:
-            try:
-                device_manager.add_device(device)
-                added_count += 1
-            except Exception as e:
-                logger.error(f"❌ Error auto-adding device {device['hostname']}: {e}")
+        for failure in result['errors']:
+            logger.error(f"❌ Error auto-adding device {failure['hostname']}: {failure['error']}")
+        
+        added_count = len(result['added'])
         
         if added_count > 0:
+            # Devices-page and other device-list caches are keyed on the shared inventory version
+            bump_inventory_version()
             st.success(f"✅ Automatically added {added_count} devices to inventory")
             notification_manager.add_notification(
                 f"Auto-added {added_count} discovered devices",
@@ -715,15 +871,17 @@ class TopologyPage:
         """Run topology analysis"""
         try:
             with show_loading_spinner(f"Running {analysis_type}..."):
-                # Simulate analysis
+                # Build (or reuse the cached) topology once and share it with the analyzer
+                topology_data = self._generate_topology_data(devices, None)
+                
                 if analysis_type == "Network Centrality":
-                    results = self._analyze_network_centrality(devices)
+                    results = self._analyze_network_centrality(topology_data)
                 elif analysis_type == "Path Analysis":
-                    results = self._analyze_network_paths(devices)
+                    results = self._analyze_network_paths(topology_data)
                 elif analysis_type == "Redundancy Analysis":
-                    results = self._analyze_network_redundancy(devices)
+                    results = self._analyze_network_redundancy(topology_data)
                 elif analysis_type == "Bottleneck Detection":
-                    results = self._analyze_network_bottlenecks(devices)
+                    results = self._analyze_network_bottlenecks(topology_data)
                 else:
                     results = {"error": "Unknown analysis type"}
                 
@@ -735,43 +893,98 @@ class TopologyPage:
             logger.error(f"❌ Error running topology analysis: {e}")
             st.error(f"Error running {analysis_type}")
     
-    def _analyze_network_centrality(self, devices):
-        """Analyze network centrality metrics"""
+    def _analyze_network_centrality(self, topology_data):
+        """Analyze network centrality metrics (degree centrality of the topology graph)"""
+        nodes = topology_data['nodes']
+        indptr, _ = topology_data['csr']
+        
+        if nodes.empty:
+            return {'type': 'centrality', 'most_central': 'None', 'centrality_scores': {}, 'summary': 'No devices to analyze'}
+        
+        # Degree of every node straight from the CSR row lengths
+        degree = np.diff(indptr)
+        scores = degree / max(len(nodes) - 1, 1)
+        
+        labels = nodes['label'].to_numpy()
+        top = np.argsort(-scores, kind='stable')[:5]
+        most_central = labels[top[0]]
+        
         return {
             'type': 'centrality',
-            'most_central': devices[0]['hostname'] if devices else 'None',
-            'centrality_scores': {device['hostname']: np.random.uniform(0.1, 1.0) for device in devices[:5]},
-            'summary': 'Analysis shows Router-01 as the most central device in the network'
+            'most_central': most_central,
+            'centrality_scores': {labels[i]: float(scores[i]) for i in top},
+            'summary': f'Analysis shows {most_central} as the most central device in the network'
         }
     
-    def _analyze_network_paths(self, devices):
-        """Analyze network path redundancy"""
+    def _analyze_network_paths(self, topology_data):
+        """Analyze network path redundancy (hop distances, articulation points and bridges)"""
+        nodes = topology_data['nodes']
+        edges = topology_data['edges']
+        graph = topology_data['graph']
+        
+        node_ids = tuple(nodes['id'].tolist())
+        links = tuple(zip(edges['source'].tolist(), edges['target'].tolist()))
+        
+        # Every pairwise distance at once, cached per topology
+        distances = _hop_distances(node_ids, links, graph, topology_data['csr'])
+        pair_distances = distances[~np.eye(len(node_ids), dtype=bool)]
+        pair_distances = pair_distances[np.isfinite(pair_distances)]
+        
+        single_points_of_failure = sum(1 for _ in nx.articulation_points(graph))
+        redundant_paths = graph.number_of_edges() - sum(1 for _ in nx.bridges(graph))
+        
+        if single_points_of_failure:
+            summary = f'{single_points_of_failure} device(s) would split the network if they failed'
+        else:
+            summary = 'Network has good path redundancy with no single points of failure'
+        
         return {
             'type': 'paths',
-            'redundant_paths': len(devices) // 2,
-            'single_points_of_failure': max(0, len(devices) - 3),
-            'average_path_length': np.random.uniform(2.0, 4.0),
-            'summary': 'Network has good path redundancy with few single points of failure'
+            'redundant_paths': redundant_paths,
+            'single_points_of_failure': single_points_of_failure,
+            'average_path_length': float(pair_distances.mean()) if pair_distances.size else 0.0,
+            'summary': summary
         }
     
-    def _analyze_network_redundancy(self, devices):
-        """Analyze network redundancy"""
+    def _analyze_network_redundancy(self, topology_data):
+        """Analyze network redundancy (share of links that are not bridges, cut-vertex devices)"""
+        graph = topology_data['graph']
+        label_by_id = dict(zip(topology_data['nodes']['id'], topology_data['nodes']['label']))
+        
+        bridges = sum(1 for _ in nx.bridges(graph))
+        links = graph.number_of_edges()
+        
         return {
             'type': 'redundancy',
-            'redundancy_score': np.random.uniform(0.6, 0.9),
-            'critical_devices': [d['hostname'] for d in devices[:2]],
+            'redundancy_score': 1 - bridges / links if links else 0.0,
+            'critical_devices': [label_by_id[node] for node in nx.articulation_points(graph)],
             'recommendations': ['Add backup link between Switch-01 and Router-02', 'Consider secondary uplink'],
             'summary': 'Network redundancy is good but can be improved with additional links'
         }
     
-    def _analyze_network_bottlenecks(self, devices):
-        """Analyze potential network bottlenecks"""
+    def _analyze_network_bottlenecks(self, topology_data):
+        """Analyze potential network bottlenecks (node and link betweenness of the topology graph)"""
+        nodes = topology_data['nodes']
+        graph = topology_data['graph']
+        
+        if graph.number_of_edges() == 0:
+            return {'type': 'bottlenecks', 'potential_bottlenecks': [], 'congestion_points': [],
+                    'utilization_metrics': {}, 'summary': 'No connections to analyze'}
+        
+        label_by_id = dict(zip(nodes['id'], nodes['label']))
+        
+        # Brandes betweenness: share of shortest paths that cross each device / link
+        node_load = nx.betweenness_centrality(graph)
+        link_load = nx.edge_betweenness_centrality(graph)
+        busiest = sorted(node_load, key=node_load.get, reverse=True)[:3]
+        busiest_links = sorted(link_load, key=link_load.get, reverse=True)[:2]
+        
         return {
             'type': 'bottlenecks',
-            'potential_bottlenecks': [devices[0]['hostname']] if devices else [],
-            'congestion_points': ['Link between Router-01 and Switch-01'],
-            'utilization_metrics': {device['hostname']: np.random.uniform(0.3, 0.8) for device in devices[:3]},
-            'summary': 'Router-01 may become a bottleneck under high traffic conditions'
+            'potential_bottlenecks': [label_by_id[node] for node in busiest[:1]],
+            'congestion_points': [f'Link between {label_by_id[a]} and {label_by_id[b]}' for a, b in busiest_links],
+            'utilization_metrics': {label_by_id[node]: node_load[node] for node in busiest},
+            'summary': f'{label_by_id[busiest[0]]} may become a bottleneck under high traffic conditions'
         }
     
     def _render_analysis_results(self, results, analysis_type):
@@ -28,14 +28,45 @@ def metric_card(title: str, value: str, subtitle: str = "", card_type: str = "de
     </div>
     """, unsafe_allow_html=True)
 
-def device_metrics_row(devices: List[Dict[str, Any]], detailed: bool = False):
+def device_metrics_summary(devices: List[Dict[str, Any]]) -> Dict[str, int]:
+    """
+    Count the device metrics shown by device_metrics_row in a single pass
+    
+    Args:
+        devices: List of device dictionaries
+        
+    Returns:
+        Dict of total, online, offline, lab, routers and switches counts
+    """
+    summary = {'total': len(devices), 'online': 0, 'lab': 0, 'routers': 0, 'switches': 0}
+    
+    for d in devices:
+        if d.get('status') == 'online':
+            summary['online'] += 1
+        if 'lab' in d.get('tags', '') or any(port in str(d.get('ip_address', '')) for port in ['2221', '2222', '2223']):
+            summary['lab'] += 1
+        device_type = d.get('device_type')
+        if device_type == 'router':
+            summary['routers'] += 1
+        elif device_type == 'switch':
+            summary['switches'] += 1
+    
+    summary['offline'] = summary['total'] - summary['online']
+    return summary
+
+def device_metrics_row(devices: Optional[List[Dict[str, Any]]] = None, detailed: bool = False,
+                       summary: Optional[Dict[str, int]] = None):
     """
     Create a row of device-related metrics
     
     Args:
         devices: List of device dictionaries
         detailed: Whether to show detailed metrics
+        summary: Precomputed device_metrics_summary (skips counting devices)
     """
+    if summary is None:
+        summary = device_metrics_summary(devices or [])
+    
     if not detailed:
         # Simple 4-column layout
         col1, col2, col3, col4 = st.columns(4)
@@ -45,13 +76,10 @@ def device_metrics_row(devices: List[Dict[str, Any]], detailed: bool = False):
         col1, col2, col3, col4, col5, col6 = st.columns(6)
         cols = [col1, col2, col3, col4, col5, col6]
     
-    total_devices = len(devices)
-    online_devices = len([d for d in devices if d.get('status') == 'online'])
-    offline_devices = total_devices - online_devices
-    
-    # Lab devices count
-    lab_devices = len([d for d in devices if 'lab' in d.get('tags', '') or 
-                      any(port in str(d.get('ip_address', '')) for port in ['2221', '2222', '2223'])])
+    total_devices = summary['total']
+    online_devices = summary['online']
+    offline_devices = summary['offline']
+    lab_devices = summary['lab']
     
     with cols[0]:
         metric_card(
@@ -93,7 +121,7 @@ def device_metrics_row(devices: List[Dict[str, Any]], detailed: bool = False):
     if detailed:
         with cols[4]:
             # Device type distribution
-            routers = len([d for d in devices if d.get('device_type') == 'router'])
+            routers = summary['routers']
             metric_card(
                 title="Routers", 
                 value=str(routers),
@@ -103,7 +131,7 @@ def device_metrics_row(devices: List[Dict[str, Any]], detailed: bool = False):
             )
         
         with cols[5]:
-            switches = len([d for d in devices if d.get('device_type') == 'switch'])
+            switches = summary['switches']
             metric_card(
                 title="Switches", 
                 value=str(switches),
@@ -15,12 +15,32 @@ from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Any
 import yaml
 import jinja2
+import pandas as pd
 from pathlib import Path
 import difflib
+import functools
 import hashlib
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
 logger = logging.getLogger(__name__)
 
+TEMPLATES_DIR = Path("config/templates")
+COMPILED_TEMPLATE_CACHE_SIZE = 128
+
+# One Jinja2 environment for every ConfigManager, so compiled templates can be shared
+_jinja_env = jinja2.Environment(
+    loader=jinja2.FileSystemLoader(str(TEMPLATES_DIR)),
+    trim_blocks=True,
+    lstrip_blocks=True,
+    auto_reload=False
+)
+
+
+@functools.lru_cache(maxsize=COMPILED_TEMPLATE_CACHE_SIZE)
+def _compile_template(content_hash: str, template_content: str) -> jinja2.Template:
+    """Compiled Jinja2 template for content_hash (bounded LRU, so edited templates age out)"""
+    return _jinja_env.from_string(template_content)
+
 class ConfigManager:
     """
     Network device configuration management system
@@ -37,18 +57,14 @@ class ConfigManager:
         self.config = self._load_config(config_file)
         self.db_path = "data/configurations.db"
         self.backup_dir = Path("backups")
-        self.templates_dir = Path("config/templates")
+        self.templates_dir = TEMPLATES_DIR
         
         # Create directories
         self.backup_dir.mkdir(exist_ok=True)
         self.templates_dir.mkdir(parents=True, exist_ok=True)
         
-        # Initialize Jinja2 environment
-        self.jinja_env = jinja2.Environment(
-            loader=jinja2.FileSystemLoader(str(self.templates_dir)),
-            trim_blocks=True,
-            lstrip_blocks=True
-        )
+        # Shared Jinja2 environment
+        self.jinja_env = _jinja_env
         
         self._init_database()
         self._create_default_templates()
@@ -392,6 +408,127 @@ class ConfigManager:
         
         return backups
     
+    def get_recent_deployments(self, limit: int = 10) -> pd.DataFrame:
+        """Get the most recent template deployments as a DataFrame"""
+        with sqlite3.connect(self.db_path) as conn:
+            return pd.read_sql_query('''
+                SELECT d.deployment_date, d.device_id, t.name AS template, d.status,
+                       d.deployed_by, d.error_message
+                FROM config_deployments d
+                LEFT JOIN config_templates t ON t.id = d.template_id
+                ORDER BY d.deployment_date DESC
+                LIMIT ?
+            ''', conn, params=(limit,))
+    
+    def get_last_backup_times(self, device_ids: List[str]) -> Dict[str, Optional[datetime]]:
+        """
+        Get the most recent backup time for several devices in one query
+        
+        Args:
+            device_ids: Device IDs to look up
+            
+        Returns:
+            Dict[str, Optional[datetime]]: Last backup time per device (None if never backed up)
+        """
+        last_backups = {device_id: None for device_id in device_ids}
+        if not device_ids:
+            return last_backups
+        
+        placeholders = ','.join('?' * len(device_ids))
+        with sqlite3.connect(self.db_path) as conn:
+            cursor = conn.execute(f'''
+                SELECT device_id, MAX(backup_date) FROM config_backups
+                WHERE device_id IN ({placeholders})
+                GROUP BY device_id
+            ''', [str(device_id) for device_id in device_ids])
+            
+            for device_id, backup_date in cursor.fetchall():
+                if backup_date:
+                    last_backups[device_id] = datetime.fromisoformat(backup_date)
+        
+        return last_backups
+    
+    def get_configuration_history(self, since: Optional[datetime] = None, action: Optional[str] = None,
+                                  user: Optional[str] = None, limit: int = 50, offset: int = 0) -> List[Dict]:
+        """
+        Get configuration change history (deployments, backups and template edits)
+        
+        Args:
+            since: Only return entries at or after this UTC timestamp
+            action: Filter by action (deploy, backup, edit)
+            user: Case-insensitive substring match on user
+            limit: Maximum number of entries to return
+            offset: Number of entries to skip (for pagination)
+            
+        Returns:
+            List[Dict]: History entries, newest first
+        """
+        query = '''
+            SELECT * FROM (
+                SELECT deployment_date AS timestamp, 'deploy' AS action, device_id,
+                       status, deployed_by AS user, COALESCE(error_message, '') AS details
+                FROM config_deployments
+                UNION ALL
+                SELECT backup_date, 'backup', device_id,
+                       'success', created_by, COALESCE(description, '')
+                FROM config_backups
+                UNION ALL
+                SELECT updated_at, 'edit', NULL,
+                       'success', created_by, name
+                FROM config_templates
+            )
+            WHERE (:since IS NULL OR timestamp >= :since)
+              AND (:action IS NULL OR action = :action)
+              AND (:user IS NULL OR user LIKE '%' || :user || '%')
+            ORDER BY timestamp DESC
+            LIMIT :limit OFFSET :offset
+        '''
+        params = {
+            'since': since.strftime('%Y-%m-%d %H:%M:%S') if since else None,
+            'action': action,
+            'user': user,
+            'limit': limit,
+            'offset': offset
+        }
+        
+        with sqlite3.connect(self.db_path) as conn:
+            conn.row_factory = sqlite3.Row
+            cursor = conn.execute(query, params)
+            return [dict(row) for row in cursor.fetchall()]
+    
+    def get_audit_summary(self) -> Dict[str, Any]:
+        """
+        Get configuration audit metrics in a single query
+        
+        Returns:
+            Dict: total_changes, changes_this_week, active_templates,
+                  success_pct (None without deployments) and last_backup_ago
+                  (timedelta, None without backups)
+        """
+        with sqlite3.connect(self.db_path) as conn:
+            row = conn.execute('''
+                SELECT
+                    (SELECT COUNT(*) FROM config_deployments)
+                        + (SELECT COUNT(*) FROM config_backups) AS total_changes,
+                    (SELECT COUNT(*) FROM config_deployments WHERE deployment_date >= datetime('now', '-7 days'))
+                        + (SELECT COUNT(*) FROM config_backups WHERE backup_date >= datetime('now', '-7 days'))
+                        AS changes_this_week,
+                    (SELECT COUNT(*) FROM config_templates) AS active_templates,
+                    (SELECT AVG(status = 'success') * 100 FROM config_deployments) AS success_pct,
+                    (SELECT (julianday('now') - julianday(MAX(backup_date))) * 86400
+                     FROM config_backups) AS last_backup_seconds
+            ''').fetchone()
+        
+        total_changes, changes_this_week, active_templates, success_pct, last_backup_seconds = row
+        
+        return {
+            'total_changes': total_changes,
+            'changes_this_week': changes_this_week,
+            'active_templates': active_templates,
+            'success_pct': success_pct,
+            'last_backup_ago': timedelta(seconds=last_backup_seconds) if last_backup_seconds is not None else None
+        }
+    
     def create_config_template(self, name: str, description: str, vendor: str, 
                              device_type: str, template_content: str, 
                              variables: List[str] = None) -> str:
@@ -436,6 +573,62 @@ class ConfigManager:
         logger.info(f"Created configuration template: {name}")
         return template_id
     
+    def save_templates(self, templates: List[Dict]) -> int:
+        """
+        Create or update several configuration templates in one transaction
+        
+        Args:
+            templates: Template dicts with name, content and optional
+                       description, vendor, device_type and variables
+            
+        Returns:
+            int: Number of templates saved
+        """
+        # Deduplicate by name (last one wins) and validate syntax before touching the database
+        unique_templates = {template['name']: template for template in templates}
+        
+        rows = []
+        for name, template in unique_templates.items():
+            content = template['content']
+            try:
+                self.jinja_env.parse(content)
+            except jinja2.TemplateSyntaxError as e:
+                raise ValueError(f"Invalid Jinja2 syntax in template '{name}': {e}")
+            
+            variables = template.get('variables') or []
+            rows.append((
+                str(uuid.uuid4()),
+                name,
+                template.get('description', ''),
+                template.get('vendor', ''),
+                template.get('device_type', ''),
+                content,
+                variables if isinstance(variables, str) else json.dumps(variables)
+            ))
+        
+        with sqlite3.connect(self.db_path) as conn:
+            conn.executemany('''
+                INSERT INTO config_templates (
+                    id, name, description, vendor, device_type,
+                    template_content, variables
+                ) VALUES (?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT(name) DO UPDATE SET
+                    description = excluded.description,
+                    vendor = excluded.vendor,
+                    device_type = excluded.device_type,
+                    template_content = excluded.template_content,
+                    variables = excluded.variables,
+                    updated_at = CURRENT_TIMESTAMP
+            ''', rows)
+            conn.commit()
+        
+        logger.info(f"Saved {len(rows)} configuration templates")
+        return len(rows)
+    
+    def save_template(self, template: Dict) -> int:
+        """Create or update a single configuration template"""
+        return self.save_templates([template])
+    
     def get_config_templates(self) -> List[Dict]:
         """Get all configuration templates"""
         templates = []
@@ -451,6 +644,13 @@ class ConfigManager:
         
         return templates
     
+    def get_all_templates(self) -> List[Dict]:
+        """Get all configuration templates, with content under the 'content' key used by the UI"""
+        templates = self.get_config_templates()
+        for template in templates:
+            template['content'] = template['template_content']
+        return templates
+    
     def deploy_template(self, device_id: str, template_id: str, variables: Dict = None) -> str:
         """
         Deploy configuration template to device
@@ -472,7 +672,7 @@ class ConfigManager:
                 raise ValueError("Template not found")
             
             # Render template with variables
-            jinja_template = self.jinja_env.from_string(template['template_content'])
+            jinja_template = self.compile_template(template['template_content'])
             config_content = jinja_template.render(variables or {})
             
             # Deploy to device
@@ -510,6 +710,99 @@ class ConfigManager:
             
             raise
     
+    def compile_template(self, template_content: str) -> jinja2.Template:
+        """Get compiled Jinja2 template, compiling only on first use of this content"""
+        content_hash = hashlib.blake2b(template_content.encode('utf-8'), digest_size=8).hexdigest()
+        return _compile_template(content_hash, template_content)
+    
+    def get_template_by_name(self, name: str) -> Optional[Dict]:
+        """Get template by name"""
+        with sqlite3.connect(self.db_path) as conn:
+            conn.row_factory = sqlite3.Row
+            cursor = conn.execute('SELECT * FROM config_templates WHERE name = ?', (name,))
+            row = cursor.fetchone()
+            
+            if row:
+                template = dict(row)
+                template['variables'] = json.loads(template['variables'] or '[]')
+                return template
+            return None
+    
+    def deploy_to_device(self, device_id: str, template_name: str, variables: Dict = None,
+                         dry_run: bool = True, backup_before: bool = True) -> Dict:
+        """
+        Render a template by name and deploy it to a single device
+        
+        Args:
+            device_id: Device ID
+            template_name: Template name
+            variables: Template variables
+            dry_run: Only render the configuration, do not push it
+            backup_before: Backup the running configuration before deploying
+            
+        Returns:
+            Dict: Deployment result for the device
+        """
+        try:
+            template = self.get_template_by_name(template_name)
+            if not template:
+                raise ValueError(f"Template not found: {template_name}")
+            
+            if dry_run:
+                config_content = self.compile_template(template['template_content']).render(variables or {})
+                return {'device_id': device_id, 'success': True, 'dry_run': True, 'config': config_content}
+            
+            if backup_before:
+                self.backup_device_config(device_id, backup_type="pre-deployment",
+                                          description=f"Before deploying {template_name}")
+            
+            deployment_id = self.deploy_template(device_id, template['id'], variables)
+            return {'device_id': device_id, 'success': True, 'dry_run': False, 'deployment_id': deployment_id}
+            
+        except Exception as e:
+            logger.error(f"Error deploying {template_name} to device {device_id}: {e}")
+            return {'device_id': device_id, 'success': False, 'dry_run': dry_run, 'error': str(e)}
+    
+    def deploy_to_all(self, devices: List[Dict], template_name: str, variables: Dict = None,
+                      dry_run: bool = True, backup_before: bool = True, max_workers: int = 16) -> Dict:
+        """
+        Deploy a template to a set of devices concurrently
+        
+        Args:
+            devices: Target devices (as returned by DeviceManager.get_all_devices)
+            template_name: Template name
+            variables: Template variables
+            dry_run: Only render the configuration, do not push it
+            backup_before: Backup each device before deploying
+            max_workers: Maximum number of concurrent device sessions
+            
+        Returns:
+            Dict: successful/failed counts and per-device details (one entry per device,
+            with its device_id and hostname)
+        """
+        details = []
+        
+        if devices:
+            with ThreadPoolExecutor(max_workers=min(max_workers, len(devices))) as executor:
+                future_to_device = {
+                    executor.submit(self.deploy_to_device, device['id'], template_name,
+                                    variables, dry_run, backup_before): device
+                    for device in devices
+                }
+                
+                for future in as_completed(future_to_device):
+                    device = future_to_device[future]
+                    details.append({'hostname': device['hostname'], **future.result()})
+        
+        successful = sum(1 for result in details if result['success'])
+        logger.info(f"Deployed {template_name} to {len(details)} devices: {successful} successful")
+        
+        return {
+            'successful': successful,
+            'failed': len(details) - successful,
+            'details': details
+        }
+    
     def get_template(self, template_id: str) -> Optional[Dict]:
         """Get template by ID"""
         with sqlite3.connect(self.db_path) as conn:
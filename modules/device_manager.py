@@ -18,6 +18,13 @@ import threading
 
 logger = logging.getLogger(__name__)
 
+_INSERT_DEVICE_SQL = '''
+    INSERT INTO devices (
+        id, hostname, ip_address, device_type, vendor, model,
+        os_version, username, password, enable_password, port, tags
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+'''
+
 class DeviceManager:
     """
     Manages network device inventory and connections
@@ -110,8 +117,48 @@ class DeviceManager:
         Returns:
             str: Device ID
         """
-        device_id = str(uuid.uuid4())
+        row = self._prepare_device_row(device_data)
+        
+        with sqlite3.connect(self.db_path) as conn:
+            conn.execute(_INSERT_DEVICE_SQL, row)
+            conn.commit()
+        
+        logger.info(f"Added device: {device_data['hostname']} ({device_data['ip_address']})")
+        return row[0]
+    
+    def add_devices(self, devices: List[Dict]) -> Dict[str, Any]:
+        """
+        Add several devices to the inventory in a single transaction
+        
+        Rows that fail validation or violate a constraint (e.g. a duplicate IP
+        address) are skipped and reported instead of aborting the batch.
+        
+        Args:
+            devices: List of device information dictionaries
+            
+        Returns:
+            Dict: 'added' (list of new device IDs) and 'errors' (list of
+            {'hostname', 'error'} dicts, one per rejected row, in input order)
+        """
+        added = []
+        errors = []
+        
+        with sqlite3.connect(self.db_path) as conn:
+            for device_data in devices:
+                hostname = device_data.get('hostname', 'unknown')
+                try:
+                    row = self._prepare_device_row(device_data)
+                    conn.execute(_INSERT_DEVICE_SQL, row)
+                    added.append(row[0])
+                except (ValueError, sqlite3.IntegrityError) as e:
+                    errors.append({'hostname': hostname, 'error': str(e)})
+            conn.commit()
         
+        logger.info(f"Added {len(added)} of {len(devices)} devices in bulk")
+        return {'added': added, 'errors': errors}
+    
+    def _prepare_device_row(self, device_data: Dict) -> tuple:
+        """Validate device data, apply vendor defaults and return the devices table row (new ID first)"""
         # Validate required fields
         required_fields = ['hostname', 'ip_address', 'device_type', 'username', 'password']
         for field in required_fields:
@@ -126,30 +173,20 @@ class DeviceManager:
                 if key not in device_data:
                     device_data[key] = value
         
-        with sqlite3.connect(self.db_path) as conn:
-            conn.execute('''
-                INSERT INTO devices (
-                    id, hostname, ip_address, device_type, vendor, model,
-                    os_version, username, password, enable_password, port, tags
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            ''', (
-                device_id,
-                device_data['hostname'],
-                device_data['ip_address'],
-                device_data['device_type'],
-                device_data.get('vendor', ''),
-                device_data.get('model', ''),
-                device_data.get('os_version', ''),
-                device_data['username'],
-                device_data['password'],
-                device_data.get('enable_password', ''),
-                device_data.get('port', 22),
-                json.dumps(device_data.get('tags', []))
-            ))
-            conn.commit()
-        
-        logger.info(f"Added device: {device_data['hostname']} ({device_data['ip_address']})")
-        return device_id
+        return (
+            str(uuid.uuid4()),
+            device_data['hostname'],
+            device_data['ip_address'],
+            device_data['device_type'],
+            device_data.get('vendor', ''),
+            device_data.get('model', ''),
+            device_data.get('os_version', ''),
+            device_data['username'],
+            device_data['password'],
+            device_data.get('enable_password', ''),
+            device_data.get('port', 22),
+            json.dumps(device_data.get('tags', []))
+        )
     
     def get_device(self, device_id: str) -> Optional[Dict]:
         """Get device by ID"""
@@ -41,6 +41,9 @@ class NetworkMonitor:
     - Network topology discovery
     """
     
+    # Status checks open their own sqlite connection/socket per call, so they can run concurrently
+    thread_safe = True
+    
     def __init__(self, config_file: str = "config.json"):
         self.config = self._load_config(config_file)
         self.db_path = "data/monitoring.db"
@@ -377,6 +380,28 @@ class NetworkMonitor:
         
         return alerts
     
+    def get_active_alerts(self, limit: int = 50) -> List[Dict]:
+        """Get recent unacknowledged alerts"""
+        alerts = []
+        
+        try:
+            with sqlite3.connect(self.db_path) as conn:
+                conn.row_factory = sqlite3.Row
+                cursor = conn.execute('''
+                    SELECT * FROM alerts
+                    WHERE NOT acknowledged
+                    ORDER BY timestamp DESC
+                    LIMIT ?
+                ''', (limit,))
+                
+                for row in cursor.fetchall():
+                    alerts.append(dict(row))
+        
+        except Exception as e:
+            logger.error(f"Error getting active alerts: {e}")
+        
+        return alerts
+    
     def acknowledge_alert(self, alert_id: str, acknowledged_by: str = "system") -> bool:
         """Acknowledge an alert"""
         try:
@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+"""
+Tests for the configuration manager's database queries
+"""
+
+import pytest
+import sqlite3
+import sys
+import os
+from datetime import datetime, timedelta
+
+# Add the project root to the Python path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+pytest.importorskip("jinja2")
+pytest.importorskip("yaml")
+pytest.importorskip("pandas")
+
+from modules.config_manager import ConfigManager
+
+@pytest.fixture
+def config_manager(tmp_path, monkeypatch):
+    """ConfigManager backed by a fresh database (its paths are relative to the working directory)"""
+    monkeypatch.chdir(tmp_path)
+    return ConfigManager(config_file="missing-config.json")
+
+def _insert_backups(config_manager, count):
+    """Insert count backups, one minute apart (backup-0 is the oldest)"""
+    with sqlite3.connect(config_manager.db_path) as conn:
+        conn.executemany(
+            '''INSERT INTO config_backups (id, device_id, backup_date, config_hash, file_path, description)
+               VALUES (?, ?, ?, ?, ?, ?)''',
+            [(f'b{i}', 'dev-1', f'2024-01-01 00:{i:02d}:00', 'hash', f'backups/b{i}.cfg', f'backup-{i}')
+             for i in range(count)]
+        )
+        conn.commit()
+
+def test_configuration_history_pagination(config_manager):
+    """LIMIT/OFFSET pages through the history newest first, without gaps or overlap"""
+    _insert_backups(config_manager, 5)
+
+    pages = [
+        config_manager.get_configuration_history(action='backup', limit=2, offset=offset)
+        for offset in (0, 2, 4, 6)
+    ]
+
+    assert [[entry['details'] for entry in page] for page in pages] == [
+        ['backup-4', 'backup-3'],
+        ['backup-2', 'backup-1'],
+        ['backup-0'],
+        [],
+    ]
+
+def test_last_backup_times_per_device(config_manager):
+    """One query returns each device's latest backup, and None for devices never backed up"""
+    _insert_backups(config_manager, 3)
+    with sqlite3.connect(config_manager.db_path) as conn:
+        conn.execute(
+            '''INSERT INTO config_backups (id, device_id, backup_date, config_hash, file_path)
+               VALUES ('other', 'dev-2', '2023-06-01 12:00:00', 'hash', 'backups/other.cfg')'''
+        )
+        conn.commit()
+
+    assert config_manager.get_last_backup_times(['dev-1', 'dev-2', 'dev-3']) == {
+        'dev-1': datetime(2024, 1, 1, 0, 2),
+        'dev-2': datetime(2023, 6, 1, 12, 0),
+        'dev-3': None,
+    }
+    assert config_manager.get_last_backup_times([]) == {}
+
+def test_audit_summary_without_history(config_manager):
+    """With no deployments or backups the rates and ages are None rather than errors"""
+    summary = config_manager.get_audit_summary()
+
+    assert summary['total_changes'] == 0
+    assert summary['changes_this_week'] == 0
+    assert summary['active_templates'] == len(config_manager.get_config_templates())
+    assert summary['success_pct'] is None
+    assert summary['last_backup_ago'] is None
+
+def test_audit_summary_counts(config_manager):
+    """Totals, the 7-day window, success rate and last backup age come from one query"""
+    with sqlite3.connect(config_manager.db_path) as conn:
+        conn.executemany(
+            'INSERT INTO config_deployments (id, device_id, status) VALUES (?, ?, ?)',
+            [('d1', 'dev-1', 'success'), ('d2', 'dev-1', 'failed')]
+        )
+        conn.execute(
+            '''INSERT INTO config_deployments (id, device_id, status, deployment_date)
+               VALUES ('d3', 'dev-2', 'success', '2020-01-01 00:00:00')'''
+        )
+        conn.execute(
+            '''INSERT INTO config_backups (id, device_id, config_hash, file_path)
+               VALUES ('b-new', 'dev-1', 'hash', 'backups/new.cfg')'''
+        )
+        conn.commit()
+    _insert_backups(config_manager, 1)
+
+    summary = config_manager.get_audit_summary()
+
+    assert summary['total_changes'] == 5
+    assert summary['changes_this_week'] == 3
+    assert summary['success_pct'] == pytest.approx(200 / 3)
+    assert timedelta(0) <= summary['last_backup_ago'] < timedelta(minutes=1)
+
+def test_deploy_to_all_reports_every_device(config_manager):
+    """Dry-run deploys render once per device, and devices sharing a hostname keep separate results"""
+    config_manager.save_template({'name': 'hostname', 'content': 'hostname {{ name }}'})
+    devices = [
+        {'id': 'dev-1', 'hostname': 'edge'},
+        {'id': 'dev-2', 'hostname': 'edge'},
+        {'id': 'dev-3', 'hostname': 'core'},
+    ]
+
+    result = config_manager.deploy_to_all(devices, 'hostname', {'name': 'r1'}, dry_run=True)
+
+    assert result['successful'] == 3
+    assert result['failed'] == 0
+    assert sorted((entry['device_id'], entry['hostname']) for entry in result['details']) == [
+        ('dev-1', 'edge'), ('dev-2', 'edge'), ('dev-3', 'core')
+    ]
+    assert all(entry['config'] == 'hostname r1' for entry in result['details'])
+
+def test_deploy_to_all_counts_failures(config_manager):
+    """An unknown template fails every device without raising; no devices means nothing to do"""
+    result = config_manager.deploy_to_all([{'id': 'dev-1', 'hostname': 'edge'}], 'missing')
+
+    assert result['successful'] == 0
+    assert result['failed'] == 1
+    assert 'Template not found' in result['details'][0]['error']
+
+    assert config_manager.deploy_to_all([], 'missing') == {'successful': 0, 'failed': 0, 'details': []}
+
+def test_save_templates_updates_existing_template(config_manager):
+    """Saving a template whose name exists updates it in place instead of failing"""
+    assert config_manager.save_templates([
+        {'name': 'ntp', 'content': 'ntp server {{ server }}', 'variables': ['server']}
+    ]) == 1
+    original = config_manager.get_template_by_name('ntp')
+
+    assert config_manager.save_templates([
+        {'name': 'ntp', 'content': 'ntp server {{ primary }}', 'description': 'NTP',
+         'variables': {'primary': 'string'}},
+        {'name': 'dns', 'content': 'ip name-server {{ server }}'},
+    ]) == 2
+
+    updated = config_manager.get_template_by_name('ntp')
+    assert updated['id'] == original['id']
+    assert updated['template_content'] == 'ntp server {{ primary }}'
+    assert updated['description'] == 'NTP'
+    assert updated['variables'] == {'primary': 'string'}
+    assert config_manager.get_template_by_name('dns') is not None
+
+def test_save_templates_rejects_invalid_syntax(config_manager):
+    """A template with broken Jinja2 syntax is rejected before anything is written"""
+    with pytest.raises(ValueError):
+        config_manager.save_templates([
+            {'name': 'good', 'content': 'hostname {{ hostname }}'},
+            {'name': 'bad', 'content': 'hostname {{ hostname'},
+        ])
+
+    assert config_manager.get_template_by_name('good') is None
@@ -0,0 +1,47 @@
+#!/usr/bin/env python3
+"""
+Tests for the LTTB downsampling in utils.data_processing
+"""
+
+import pytest
+import sys
+import os
+
+# Add the project root to the Python path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+np = pytest.importorskip("numpy")
+pytest.importorskip("pandas")
+
+from utils.data_processing import DataProcessor
+
+@pytest.fixture
+def series():
+    """A noisy 1000-point series"""
+    rng = np.random.default_rng(0)
+    x = np.arange(1000, dtype=float)
+    y = np.sin(x / 50) + rng.normal(0, 0.1, size=x.size)
+    return x, y
+
+def test_lttb_keeps_endpoints(series):
+    """The first and last points are always kept"""
+    x, y = series
+    indices = DataProcessor.lttb_indices(x, y, 100)
+    assert indices[0] == 0
+    assert indices[-1] == len(x) - 1
+
+def test_lttb_output_length_matches_threshold(series):
+    """Exactly threshold points come back, in increasing order and without repeats"""
+    x, y = series
+    for threshold in (3, 10, 100, 999):
+        indices = DataProcessor.lttb_indices(x, y, threshold)
+        assert len(indices) == threshold
+        assert np.all(np.diff(indices) > 0)
+
+def test_lttb_short_input_passes_through():
+    """Series no longer than the threshold (or thresholds below 3) are returned unchanged"""
+    x = np.arange(5, dtype=float)
+    y = x ** 2
+    assert DataProcessor.lttb_indices(x, y, 5).tolist() == [0, 1, 2, 3, 4]
+    assert DataProcessor.lttb_indices(x, y, 50).tolist() == [0, 1, 2, 3, 4]
+    assert DataProcessor.lttb_indices(x, y, 2).tolist() == [0, 1, 2, 3, 4]
@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""
+Tests for bulk device inserts in modules.device_manager
+"""
+
+import pytest
+import sys
+import os
+
+# Add the project root to the Python path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+pytest.importorskip("netmiko")
+
+from modules.device_manager import DeviceManager
+
+@pytest.fixture
+def device_manager(tmp_path, monkeypatch):
+    """DeviceManager backed by a fresh database (the database path is relative to the working directory)"""
+    monkeypatch.chdir(tmp_path)
+    return DeviceManager(config_file="missing-config.json")
+
+def _device(hostname, ip_address, **extra):
+    return {
+        'hostname': hostname,
+        'ip_address': ip_address,
+        'device_type': 'cisco_ios',
+        'username': 'admin',
+        'password': 'secret',
+        **extra
+    }
+
+def test_add_devices_reports_bad_rows_and_inserts_the_rest(device_manager):
+    """A duplicate IP and a row missing a required field are reported; the other rows are committed"""
+    existing_id = device_manager.add_device(_device('core-1', '10.0.0.1'))
+
+    invalid = _device('edge-2', '10.0.0.3')
+    del invalid['password']
+
+    result = device_manager.add_devices([
+        _device('edge-1', '10.0.0.2'),
+        _device('core-1-dup', '10.0.0.1'),
+        invalid,
+        _device('edge-3', '10.0.0.4'),
+    ])
+
+    assert len(result['added']) == 2
+    assert [error['hostname'] for error in result['errors']] == ['core-1-dup', 'edge-2']
+    assert 'password' in result['errors'][1]['error']
+
+    devices = {device['hostname']: device for device in device_manager.get_all_devices()}
+    assert set(devices) == {'core-1', 'edge-1', 'edge-3'}
+    assert devices['core-1']['id'] == existing_id
+    assert {devices['edge-1']['id'], devices['edge-3']['id']} == set(result['added'])
+
+def test_add_devices_reports_every_duplicate_hostname(device_manager):
+    """Errors are a list, so rejected rows sharing a hostname are all reported"""
+    device_manager.add_device(_device('sw', '10.0.1.1'))
+
+    result = device_manager.add_devices([_device('sw', '10.0.1.1'), _device('sw', '10.0.1.1')])
+
+    assert result['added'] == []
+    assert len(result['errors']) == 2
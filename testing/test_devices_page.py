@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Tests for the device list filtering on the devices page
+"""
+
+import pytest
+import sys
+import os
+
+# Add the project root to the Python path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+pd = pytest.importorskip("pandas")
+pytest.importorskip("streamlit")
+pytest.importorskip("psutil")
+pytest.importorskip("netmiko")
+
+from app_pages.devices import DevicesPage
+
+DEVICES = [
+    {'id': '1', 'hostname': 'Core-RTR-01', 'ip_address': '10.0.0.1', 'device_type': 'cisco_ios', 'status': 'online'},
+    {'id': '2', 'hostname': 'edge-sw-01', 'ip_address': '10.0.1.1', 'device_type': 'cisco_nxos', 'status': 'offline'},
+    {'id': '3', 'hostname': 'edge-sw-02', 'ip_address': '192.168.1.10', 'device_type': 'cisco_nxos', 'status': 'online'},
+    {'id': '4', 'hostname': 'fw.lab', 'ip_address': '172.16.0.1', 'device_type': 'paloalto', 'status': 'online'},
+]
+
+@pytest.fixture
+def page():
+    return DevicesPage()
+
+@pytest.fixture
+def devices():
+    return pd.DataFrame(DEVICES)
+
+def _ids(filtered):
+    return [device['id'] for device in filtered]
+
+def test_filter_by_type_and_status(page, devices):
+    """Type and status masks combine with AND; 'All' disables a mask"""
+    assert _ids(page._filter_devices(devices, 'cisco_nxos', 'All', '')) == ['2', '3']
+    assert _ids(page._filter_devices(devices, 'All', 'online', '')) == ['1', '3', '4']
+    assert _ids(page._filter_devices(devices, 'cisco_nxos', 'online', '')) == ['3']
+    assert page._filter_devices(devices, 'paloalto', 'offline', '') == []
+
+def test_search_matches_hostname_or_ip_case_insensitively(page, devices):
+    """Search is a case-insensitive substring match on hostname or IP address"""
+    assert _ids(page._filter_devices(devices, 'All', 'All', 'CORE')) == ['1']
+    assert _ids(page._filter_devices(devices, 'All', 'All', '192.168')) == ['3']
+    assert _ids(page._filter_devices(devices, 'All', 'All', 'edge')) == ['2', '3']
+
+def test_search_is_literal(page, devices):
+    """Regex metacharacters in the search term are matched literally"""
+    assert _ids(page._filter_devices(devices, 'All', 'All', 'fw.')) == ['4']
+    assert page._filter_devices(devices, 'All', 'All', 'e.ge') == []
+
+def test_precomputed_search_index_gives_same_result(page, devices):
+    """Passing the cached lowercase index does not change the result"""
+    index = pd.DataFrame({
+        'hostname': devices['hostname'].str.lower(),
+        'ip_address': devices['ip_address'].str.lower(),
+    }, index=devices.index)
+
+    for args in (('All', 'All', 'edge'), ('cisco_nxos', 'online', '10'), ('All', 'online', 'RTR')):
+        assert page._filter_devices(devices, *args, search_index=index) == page._filter_devices(devices, *args)
+
+def test_filtered_records_use_none_for_missing_values(page):
+    """The filtered path returns the same record shape as the unfiltered one: None, never NaN"""
+    raw = [
+        {'id': '1', 'hostname': 'r1', 'ip_address': '10.0.0.1', 'device_type': 'cisco_ios',
+         'status': 'online', 'model': 'ISR4331', 'port': 22},
+        {'id': '2', 'hostname': 'r2', 'ip_address': '10.0.0.2', 'device_type': 'cisco_ios',
+         'status': 'online', 'model': None, 'port': None},
+    ]
+
+    filtered = page._filter_devices(pd.DataFrame(raw), 'cisco_ios', 'All', '')
+
+    assert filtered[1]['model'] is None
+    assert filtered[1]['port'] is None
+    assert filtered[0]['model'] == 'ISR4331'
+    assert [set(device) for device in filtered] == [set(device) for device in raw]
@@ -340,6 +340,42 @@ class DataProcessor:
             logger.error(f"❌ Error generating summary stats: {e}")
             return {}
     
+    @staticmethod
+    def lttb_indices(x: np.ndarray, y: np.ndarray, threshold: int) -> np.ndarray:
+        """Indices of the points kept by Largest-Triangle-Three-Buckets downsampling"""
+        x = np.asarray(x, dtype=float)
+        y = np.asarray(y, dtype=float)
+        n = len(y)
+        
+        if threshold >= n or threshold < 3:
+            return np.arange(n)
+        
+        # First and last points are always kept; the rest are split into equal buckets
+        bucket_size = (n - 2) / (threshold - 2)
+        indices = np.empty(threshold, dtype=np.int64)
+        indices[0] = 0
+        a = 0
+        
+        for i in range(threshold - 2):
+            start = int(i * bucket_size) + 1
+            end = int((i + 1) * bucket_size) + 1
+            
+            # Average of the next bucket is the third triangle vertex
+            next_start = end
+            next_end = min(int((i + 2) * bucket_size) + 1, n)
+            avg_x = x[next_start:next_end].mean()
+            avg_y = y[next_start:next_end].mean()
+            
+            areas = np.abs(
+                (x[a] - avg_x) * (y[start:end] - y[a]) -
+                (x[a] - x[start:end]) * (avg_y - y[a])
+            )
+            a = start + int(np.argmax(areas))
+            indices[i + 1] = a
+        
+        indices[-1] = n - 1
+        return indices
+    
     @staticmethod
     def export_to_csv(df: pd.DataFrame, filename: str) -> bool:
         """Export DataFrame to CSV file"""
@@ -220,6 +220,32 @@ class NotificationManager:
 # Global notification manager
 notification_manager = NotificationManager()
 
+# st.fragment (Streamlit >= 1.37) / st.experimental_fragment (1.33 - 1.36)
+_st_fragment = getattr(st, 'fragment', None) or getattr(st, 'experimental_fragment', None)
+
+def fragment(func: Optional[Callable] = None, *, run_every: Optional[float] = None) -> Callable:
+    """Rerun only the decorated function on widget interaction (or every run_every seconds), when supported"""
+    if func is None:
+        return lambda f: fragment(f, run_every=run_every)
+    if _st_fragment is None:
+        return func
+    return _st_fragment(func, run_every=run_every)
+
+@st.cache_resource(show_spinner=False)
+def _inventory_state() -> Dict[str, Any]:
+    """Process-wide device inventory version, shared by every session"""
+    return {'version': 0, 'lock': threading.Lock()}
+
+def inventory_version() -> int:
+    """Current device inventory version (cache key for anything derived from the device list)"""
+    return _inventory_state()['version']
+
+def bump_inventory_version():
+    """Invalidate cached device data in every session after the inventory changes"""
+    state = _inventory_state()
+    with state['lock']:
+        state['version'] += 1
+
 def show_loading_spinner(text: str = "Loading..."):
     """Show loading spinner with text"""
     return st.spinner(text)